@@ -14,6 +14,7 @@ import numpy as np
 from backend.planogram_analyzer import PlanogramAnalyzer
 from backend.config import PlanogramConfig, DeploymentConfig
 from backend.planogram_annotator import PlanogramAnnotator
+from backend.coordinate_system import CoordinateSystem
 from backend.streamlit_drawer import create_planogram_drawing_interface, generate_planogram_config, save_planogram_config
 
 # Page configuration
@@ -293,6 +294,10 @@ def main():
         if uploaded_file is not None:
             # Load the original image for analysis
             original_image = Image.open(uploaded_file)
+            if original_image.format == 'JPEG':
+                # Let libjpeg downscale by 1/2, 1/4 or 1/8 while decoding (never below
+                # the reference analysis size) instead of decoding full camera resolution
+                original_image.draft('RGB', CoordinateSystem.get_reference_dimensions())
             
             # Create a resized version for display
             display_image = _resize_image_for_display(original_image, max_width=600)
@@ -1,37 +1,327 @@
 import json
+import mmap
 import os
-from typing import Dict, List, Optional
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from sys import intern
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+import numpy as np
 from .models import PlanogramSection, BoundingBox
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Config files larger than this are memory-mapped instead of read into memory
+_MMAP_THRESHOLD_BYTES = 64 * 1024
+
+# Parse results of config files keyed by path -> (mtime_ns, size, is_valid)
+_CONFIG_VALIDITY_CACHE: Dict[str, Tuple[int, int, bool]] = {}
+
+# Above this many new/modified config files, validation parses them in a thread pool
+_PARALLEL_VALIDATION_MIN_FILES = 4
+
+# Cell size (reference pixels) of the uniform grid used for point-in-section queries
+_GRID_CELL_SIZE = 64
+
+# Required-field extractors for section entries in config files
+_get_section_fields = itemgetter('section_id', 'name', 'expected_items', 'expected_count', 'position')
+_get_position_fields = itemgetter('x1', 'y1', 'x2', 'y2')
+
+# Demo directory (parent of backend), fixed for the process lifetime
+_DEMO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _json_load(path: str):
+    """Read and parse a JSON file, using orjson when available"""
+    with open(path, 'rb') as f:
+        # Large files are parsed straight from a memory map to avoid an extra heap copy
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        data = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dump(obj, path: str) -> None:
+    """
+    Atomically write an object to a JSON file (2-space indent), using orjson when available.
+    The payload goes to a sibling temp file that replaces the target in one step, so
+    readers never see a partially written config.
+    """
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(obj, indent=2).encode('utf-8')
+    
+    # A unique temp file per write, so concurrent saves of the same config never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@lru_cache(maxsize=None)
+def _getenv(key: str, default: str) -> str:
+    """Cached os.getenv - deployment settings are fixed for the process lifetime"""
+    return os.getenv(key, default)
+
+
+# Default configurations written to the config directory when missing
+_STORE_004_DEFAULT: Dict = {
+    "metadata": {
+        "name": "Store 004 Demo",
+        "store_id": "STORE_004",
+        "created_date": "2024-01-01",
+        "version": "1.0",
+        "description": "Configuration with expected visible counts considering occlusion"
+    },
+    "planogram_image_path": "config/images/store_003_planogram.jpg",
+    "sections": [
+        {
+            "section_id": "SECTION_WATER",
+            "name": "Water",
+            "expected_items": ["bottled_drinks"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 40, "y1": 65, "x2": 283, "y2": 385},
+            "priority": "Low"
+        },
+        {
+            "section_id": "SECTION_CANNED_DRINKS", 
+            "name": "Soda",
+            "expected_items": ["canned_drinks"],
+            "expected_count": 6,
+            "expected_visible_count": 2,
+            "position": {"x1": 275, "y1": 230, "x2": 452, "y2": 390},
+            "priority": "Low"
+        },
+        {
+            "section_id": "SECTION_LARGE_YOGURT",
+            "name": "Large Yogurt", 
+            "expected_items": ["yogurt_cups_large"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 451, "y1": 217, "x2": 702, "y2": 396},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_SMALL_YOGURT",
+            "name": "Small Yogurt",
+            "expected_items": ["yogurt_cups_small"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 697, "y1": 216, "x2": 987, "y2": 401},
+            "priority": "Medium"
+        },
+        {
+            "section_id": "SECTION_SALADS",
+            "name": "Salads",
+            "expected_items": ["salads_bowls"],
+            "expected_count": 6,
+            "expected_visible_count": 4,
+            "position": {"x1": 41, "y1": 403, "x2": 630, "y2": 734},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_LARGE_PLATES",
+            "name": "Large Plates", 
+            "expected_items": ["large_plates"],
+            "expected_count": 6,
+            "expected_visible_count": 3,
+            "position": {"x1": 627, "y1": 404, "x2": 1019, "y2": 739},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_WRAPS",
+            "name": "Wraps",
+            "expected_items": ["wraps"],
+            "expected_count": 4,
+            "expected_visible_count": 4,
+            "position": {"x1": 65, "y1": 760, "x2": 422, "y2": 1062},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_SANDWICHES",
+            "name": "Sandwiches",
+            "expected_items": ["sandwiches"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 419, "y1": 774, "x2": 636, "y2": 1068},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_SMALL_PLATES",
+            "name": "Small Plates",
+            "expected_items": ["small_plates"],
+            "expected_count": 6,
+            "expected_visible_count": 3,
+            "position": {"x1": 606, "y1": 747, "x2": 1000, "y2": 1076},
+            "priority": "High"
+        }
+    ]
+}
+
+_STORE_005_DEFAULT: Dict = {
+    "metadata": {
+        "name": "Pick Demo v2",
+        "store_id": "STORE_005",
+        "created_date": "2024-01-01",
+        "version": "1.0",
+        "description": ""
+    },
+    "planogram_image_path": "config/images/store_005_planogram.jpg",
+    "sections": [
+        {
+            "section_id": "SECTION_WATER",
+            "name": "Water",
+            "expected_items": ["bottled_drinks"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 64, "y1": 67, "x2": 283, "y2": 390},
+            "priority": "Medium"
+        },
+        {
+            "section_id": "SECTION_CANNED_DRINKS",
+            "name": "Soda",
+            "expected_items": ["canned_drinks"],
+            "expected_count": 6,
+            "expected_visible_count": 2,
+            "position": {"x1": 283, "y1": 209, "x2": 459, "y2": 392},
+            "priority": "Medium"
+        },
+        {
+            "section_id": "SECTION_LARGE_YOGURT",
+            "name": "Large Yogurts",
+            "expected_items": ["yogurt_cups_large"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 457, "y1": 209, "x2": 697, "y2": 392},
+            "priority": "Medium"
+        },
+        {
+            "section_id": "SECTION_SMALL_YOGURT",
+            "name": "Small Yogurts",
+            "expected_items": ["yogurt_cups_small"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 696, "y1": 208, "x2": 1006, "y2": 393},
+            "priority": "Medium"
+        },
+        {
+            "section_id": "SECTION_SALADS",
+            "name": "Salads",
+            "expected_items": ["salads_bowls"],
+            "expected_count": 6,
+            "expected_visible_count": 4,
+            "position": {"x1": 48, "y1": 406, "x2": 640, "y2": 734},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_LARGE_PLATES",
+            "name": "Large Plates",
+            "expected_items": ["large_plates"],
+            "expected_count": 6,
+            "expected_visible_count": 3,
+            "position": {"x1": 640, "y1": 406, "x2": 1001, "y2": 736},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_WRAPS",
+            "name": "Wraps",
+            "expected_items": ["wraps"],
+            "expected_count": 6,
+            "expected_visible_count": 4,
+            "position": {"x1": 76, "y1": 764, "x2": 424, "y2": 1080},
+            "priority": "Medium"
+        },
+        {
+            "section_id": "SECTION_SANDWICHES",
+            "name": "Sandwiches",
+            "expected_items": ["sandwiches"],
+            "expected_count": 4,
+            "expected_visible_count": 2,
+            "position": {"x1": 424, "y1": 764, "x2": 624, "y2": 1081},
+            "priority": "High"
+        },
+        {
+            "section_id": "SECTION_SMALL_PLATES",
+            "name": "Small Plates",
+            "expected_items": ["small_plates"],
+            "expected_count": 6,
+            "expected_visible_count": 3,
+            "position": {"x1": 622, "y1": 764, "x2": 968, "y2": 1084},
+            "priority": "High"
+        }
+    ]
+}
+
+# Read-only filename -> default config table
+_DEFAULT_CONFIGS: Mapping[str, Dict] = MappingProxyType({
+    "store_004.json": _STORE_004_DEFAULT,
+    "store_005.json": _STORE_005_DEFAULT,
+})
+
+# Config directories already checked for default configs in this process
+_defaults_initialized: Set[str] = set()
+
+
 class DeploymentConfig:
     """Handles deployment-specific configuration with environment variable support"""
     
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Drop cached environment lookups (e.g. after os.environ is modified)"""
+        _getenv.cache_clear()
+        DeploymentConfig.get_model_weights_path.cache_clear()
+    
     @staticmethod
     def get_config_dir() -> str:
         """Get configuration directory path"""
-        return os.getenv('PLANOGRAM_CONFIG_DIR', 'config/planograms')
+        return _getenv('PLANOGRAM_CONFIG_DIR', 'config/planograms')
     
     @staticmethod
     def get_images_dir() -> str:
         """Get images directory path"""
-        return os.getenv('PLANOGRAM_IMAGES_DIR', 'config/images')
+        return _getenv('PLANOGRAM_IMAGES_DIR', 'config/images')
     
     @staticmethod
     def get_weights_dir() -> str:
         """Get model weights directory path"""
-        return os.getenv('PLANOGRAM_WEIGHTS_DIR', 'weights')
+        return _getenv('PLANOGRAM_WEIGHTS_DIR', 'weights')
     
     @staticmethod
     def get_model_weights_file() -> str:
         """Get model weights file name"""
-        return os.getenv('PLANOGRAM_MODEL_WEIGHTS', 'pick-instance-seg-v11-1.2.pt')
+        return _getenv('PLANOGRAM_MODEL_WEIGHTS', 'pick-instance-seg-v11-1.2.pt')
+    
+    @staticmethod
+    def get_inference_device() -> str:
+        """Get inference device ('auto' picks the first CUDA GPU when available, else CPU)"""
+        return _getenv('PLANOGRAM_DEVICE', 'auto')
     
     @staticmethod
     def get_temp_dir() -> str:
         """Get temporary directory path"""
-        return os.getenv('PLANOGRAM_TEMP_DIR', '/tmp' if os.name != 'nt' else os.path.join(os.path.expanduser('~'), 'temp'))
+        return _getenv('PLANOGRAM_TEMP_DIR', '/tmp' if os.name != 'nt' else os.path.join(os.path.expanduser('~'), 'temp'))
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_model_weights_path() -> str:
         """Get full path to model weights file"""
         weights_dir = DeploymentConfig.get_weights_dir()
@@ -39,10 +329,7 @@ class DeploymentConfig:
         
         # Handle relative paths by making them relative to the demo directory
         if not os.path.isabs(weights_dir):
-            # Get the demo directory (parent of backend)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            demo_dir = os.path.dirname(current_dir)
-            weights_dir = os.path.join(demo_dir, weights_dir)
+            weights_dir = os.path.join(_DEMO_DIR, weights_dir)
         
         return os.path.join(weights_dir, weights_file)
 
@@ -52,6 +339,14 @@ class PlanogramConfig:
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path
         self.sections: List[PlanogramSection] = []
+        self._by_id: Dict[str, PlanogramSection] = {}
+        self._item_index: Dict[str, List[PlanogramSection]] = {}
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        self._bounds: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        self._total_expected_count: Optional[int] = None
+        self._item_bounds: Dict[str, np.ndarray] = {}
+        self._item_rows: Dict[str, List[int]] = {}  # class -> indices into self.sections
+        self._item_row_arrays: Dict[str, np.ndarray] = {}
         self.planogram_image_path: Optional[str] = None
         self.metadata: Dict = {}
         
@@ -61,8 +356,7 @@ class PlanogramConfig:
     def load_from_file(self, config_path: str) -> None:
         """Load configuration from JSON file"""
         try:
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
+            config_data = _json_load(config_path)
             
             self.config_path = config_path
             self._parse_config(config_data)
@@ -79,79 +373,187 @@ class PlanogramConfig:
         self.planogram_image_path = config_data.get('planogram_image_path')
         
         for section_data in config_data.get('sections', []):
-            position_data = section_data['position']
-            bbox = BoundingBox(
-                x1=position_data['x1'],
-                y1=position_data['y1'],
-                x2=position_data['x2'],
-                y2=position_data['y2']
-            )
+            section_id, name, expected_items, expected_count, position_data = _get_section_fields(section_data)
+            x1, y1, x2, y2 = _get_position_fields(position_data)
             
+            # Ids, item classes and priorities come from small shared vocabularies;
+            # interning them lets index lookups and comparisons hit on identity
             section = PlanogramSection(
-                section_id=section_data['section_id'],
-                name=section_data['name'],
-                expected_items=section_data['expected_items'],
-                expected_count=section_data['expected_count'],
-                expected_visible_count=section_data.get('expected_visible_count', section_data['expected_count']),  # Default to expected_count for backward compatibility
-                position=bbox,
-                priority=section_data.get('priority', 'Medium')
+                section_id=intern(section_id),
+                name=name,
+                expected_items=[intern(item) for item in expected_items],
+                expected_count=expected_count,
+                expected_visible_count=section_data.get('expected_visible_count', expected_count),  # Default to expected_count for backward compatibility
+                position=BoundingBox(x1=x1, y1=y1, x2=x2, y2=y2),
+                priority=intern(section_data.get('priority', 'Medium'))
             )
             
             self.sections.append(section)
+        
+        self._rebuild_indexes()
     
     def save_to_file(self, config_path: str) -> None:
         """Save current configuration to JSON file"""
-        config_data = {
-            'metadata': self.metadata,
-            'planogram_image_path': self.planogram_image_path,
-            'sections': [section.to_dict() for section in self.sections]
-        }
+        config_data = self.to_dict()
         
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        config_dir = os.path.dirname(config_path)
+        if config_dir:
+            os.makedirs(config_dir, exist_ok=True)
         
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        _json_dump(config_data, config_path)
         
         self.config_path = config_path
     
     def add_section(self, section: PlanogramSection) -> None:
         """Add a new section to the configuration"""
         # Check for duplicate section IDs
-        existing_ids = [s.section_id for s in self.sections]
-        if section.section_id in existing_ids:
+        if section.section_id in self._by_id:
             raise ValueError(f"Section ID '{section.section_id}' already exists")
         
         self.sections.append(section)
+        self._index_section(len(self.sections) - 1, section)
+    
+    def update_section(self, section_id: str, **changes: Any) -> bool:
+        """
+        Update fields of a section by ID and refresh the lookup indexes.
+        Edit sections through here rather than in place so the indexes stay current.
+        Returns True if updated, False if not found
+        """
+        section = self._by_id.get(section_id)
+        if section is None:
+            return False
+        for name, value in changes.items():
+            setattr(section, name, value)
+        section.expected_items_set = frozenset(section.expected_items)
+        self._rebuild_indexes()
+        return True
     
     def remove_section(self, section_id: str) -> bool:
         """Remove a section by ID. Returns True if removed, False if not found"""
-        original_count = len(self.sections)
+        if section_id not in self._by_id:
+            return False
         self.sections = [s for s in self.sections if s.section_id != section_id]
-        return len(self.sections) < original_count
+        self._rebuild_indexes()
+        return True
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild all lookup indexes from the current section list"""
+        self._by_id = {}
+        self._item_index = {}
+        self._item_rows = {}
+        self._grid = {}
+        self._bounds = None
+        self._total_expected_count = None
+        self._item_bounds = {}
+        self._item_row_arrays = {}
+        for index, section in enumerate(self.sections):
+            self._index_section(index, section)
+    
+    def _index_section(self, index: int, section: PlanogramSection) -> None:
+        """Register a section (at position `index` in self.sections) in the lookup indexes"""
+        self._bounds = None
+        self._total_expected_count = None
+        self._item_bounds = {}
+        self._item_row_arrays = {}
+        
+        # First occurrence wins, matching the order of self.sections
+        self._by_id.setdefault(section.section_id, section)
+        
+        for item_class in section.expected_items_set:
+            self._item_index.setdefault(item_class, []).append(section)
+            self._item_rows.setdefault(item_class, []).append(index)
+        
+        # Bucket the section into every grid cell its bounding box touches
+        bbox = section.position
+        for cx in range(int(bbox.x1 // _GRID_CELL_SIZE), int(bbox.x2 // _GRID_CELL_SIZE) + 1):
+            for cy in range(int(bbox.y1 // _GRID_CELL_SIZE), int(bbox.y2 // _GRID_CELL_SIZE) + 1):
+                self._grid.setdefault((cx, cy), []).append(index)
     
     def get_section_by_id(self, section_id: str) -> Optional[PlanogramSection]:
         """Get a section by its ID"""
-        for section in self.sections:
-            if section.section_id == section_id:
-                return section
-        return None
+        return self._by_id.get(section_id)
     
     def get_sections_for_item(self, item_class: str) -> List[PlanogramSection]:
         """Get all sections that should contain a specific item class"""
-        return [
-            section for section in self.sections 
-            if item_class in section.expected_items
-        ]
+        return list(self._item_index.get(item_class, ()))
+    
+    def get_section_bounds_for_item(self, item_class: str) -> np.ndarray:
+        """
+        Get the positions of get_sections_for_item(item_class) as an (N, 4) array of
+        x1, y1, x2, y2, built once per class until the section list changes
+        """
+        bounds = self._item_bounds.get(item_class)
+        if bounds is None:
+            sections = self._item_index.get(item_class, ())
+            bounds = self._item_bounds[item_class] = BoundingBox.stack([s.position for s in sections])
+        return bounds
+    
+    def get_section_rows_for_item(self, item_class: str) -> np.ndarray:
+        """
+        Get the indices into self.sections of get_sections_for_item(item_class), in the
+        same order, as an integer array (built once per class until the section list changes)
+        """
+        rows = self._item_row_arrays.get(item_class)
+        if rows is None:
+            rows = self._item_row_arrays[item_class] = np.asarray(
+                self._item_rows.get(item_class, ()), dtype=np.intp
+            )
+        return rows
     
     def find_section_by_position(self, x: float, y: float) -> Optional[PlanogramSection]:
         """Find which section a given coordinate belongs to"""
-        for section in self.sections:
+        # Candidates are stored in section order, so the first hit wins on overlaps
+        cell = (int(x // _GRID_CELL_SIZE), int(y // _GRID_CELL_SIZE))
+        for index in self._grid.get(cell, ()):
+            section = self.sections[index]
             bbox = section.position
             if bbox.x1 <= x <= bbox.x2 and bbox.y1 <= y <= bbox.y2:
                 return section
         return None
     
+    def get_total_expected_count(self) -> int:
+        """Get the summed expected_count of all sections, computed once per section list"""
+        if self._total_expected_count is None:
+            self._total_expected_count = sum(section.expected_count for section in self.sections)
+        return self._total_expected_count
+    
+    def _section_bounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get (x1, y1, x2, y2) column arrays for all sections, built lazily"""
+        if self._bounds is None:
+            coords = BoundingBox.stack([section.position for section in self.sections])
+            self._bounds = (coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
+        return self._bounds
+    
+    def sections_containing_positions(self, xs, ys) -> np.ndarray:
+        """
+        Containment test of a batch of points against every section
+        
+        Args:
+            xs: Array-like of X coordinates
+            ys: Array-like of Y coordinates
+            
+        Returns:
+            (N, S) bool array, True at [i, j] when point i lies within self.sections[j]
+        """
+        xs = np.asarray(xs, dtype=np.float64)[:, None]
+        ys = np.asarray(ys, dtype=np.float64)[:, None]
+        x1, y1, x2, y2 = self._section_bounds()
+        
+        return (x1 <= xs) & (xs <= x2) & (y1 <= ys) & (ys <= y2)
+    
+    @staticmethod
+    def first_containing_sections(inside: np.ndarray) -> np.ndarray:
+        """
+        Reduce a sections_containing_positions() matrix to the index of the first
+        containing section per point (-1 where none), as find_section_by_position picks
+        """
+        if inside.shape[1] == 0:
+            return np.full(inside.shape[0], -1, dtype=np.intp)
+        
+        # argmax picks the first matching section, matching the scalar lookup order
+        return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+    
     @classmethod
     def create_sample_config(cls) -> 'PlanogramConfig':
         """Create a sample configuration for testing"""
@@ -220,263 +622,100 @@ class PlanogramConfig:
         return config
     
     @staticmethod
-    def _create_default_store_004_config() -> None:
-        """Create the default store_004.json configuration file"""
+    def _ensure_default_configs() -> None:
+        """Create any missing default configuration files (checked once per process)"""
         config_dir = DeploymentConfig.get_config_dir()
-        config_path = os.path.join(config_dir, "store_004.json")
-        
-        # Only create if it doesn't exist
-        if os.path.exists(config_path):
+        if config_dir in _defaults_initialized:
             return
-            
-        default_config = {
-            "metadata": {
-                "name": "Store 004 Demo",
-                "store_id": "STORE_004",
-                "created_date": "2024-01-01",
-                "version": "1.0",
-                "description": "Configuration with expected visible counts considering occlusion"
-            },
-            "planogram_image_path": "config/images/store_003_planogram.jpg",
-            "sections": [
-                {
-                    "section_id": "SECTION_WATER",
-                    "name": "Water",
-                    "expected_items": ["bottled_drinks"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 40, "y1": 65, "x2": 283, "y2": 385},
-                    "priority": "Low"
-                },
-                {
-                    "section_id": "SECTION_CANNED_DRINKS", 
-                    "name": "Soda",
-                    "expected_items": ["canned_drinks"],
-                    "expected_count": 6,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 275, "y1": 230, "x2": 452, "y2": 390},
-                    "priority": "Low"
-                },
-                {
-                    "section_id": "SECTION_LARGE_YOGURT",
-                    "name": "Large Yogurt", 
-                    "expected_items": ["yogurt_cups_large"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 451, "y1": 217, "x2": 702, "y2": 396},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_SMALL_YOGURT",
-                    "name": "Small Yogurt",
-                    "expected_items": ["yogurt_cups_small"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 697, "y1": 216, "x2": 987, "y2": 401},
-                    "priority": "Medium"
-                },
-                {
-                    "section_id": "SECTION_SALADS",
-                    "name": "Salads",
-                    "expected_items": ["salads_bowls"],
-                    "expected_count": 6,
-                    "expected_visible_count": 4,
-                    "position": {"x1": 41, "y1": 403, "x2": 630, "y2": 734},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_LARGE_PLATES",
-                    "name": "Large Plates", 
-                    "expected_items": ["large_plates"],
-                    "expected_count": 6,
-                    "expected_visible_count": 3,
-                    "position": {"x1": 627, "y1": 404, "x2": 1019, "y2": 739},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_WRAPS",
-                    "name": "Wraps",
-                    "expected_items": ["wraps"],
-                    "expected_count": 4,
-                    "expected_visible_count": 4,
-                    "position": {"x1": 65, "y1": 760, "x2": 422, "y2": 1062},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_SANDWICHES",
-                    "name": "Sandwiches",
-                    "expected_items": ["sandwiches"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 419, "y1": 774, "x2": 636, "y2": 1068},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_SMALL_PLATES",
-                    "name": "Small Plates",
-                    "expected_items": ["small_plates"],
-                    "expected_count": 6,
-                    "expected_visible_count": 3,
-                    "position": {"x1": 606, "y1": 747, "x2": 1000, "y2": 1076},
-                    "priority": "High"
-                }
-            ]
-        }
         
         try:
             os.makedirs(config_dir, exist_ok=True)
-            with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
-            print(f"✅ Created default store_004.json configuration")
-        except Exception as e:
-            print(f"❌ Error creating default config: {e}")
-
-    @staticmethod
-    def _create_default_store_005_config() -> None:
-        """Create the default store_005.json configuration file"""
-        config_dir = DeploymentConfig.get_config_dir()
-        config_path = os.path.join(config_dir, "store_005.json")
-        
-        # Only create if it doesn't exist
-        if os.path.exists(config_path):
-            return
+            with os.scandir(config_dir) as entries:
+                existing = {entry.name for entry in entries}
             
-        default_config = {
-            "metadata": {
-                "name": "Pick Demo v2",
-                "store_id": "STORE_005",
-                "created_date": "2024-01-01",
-                "version": "1.0",
-                "description": ""
-            },
-            "planogram_image_path": "config/images/store_005_planogram.jpg",
-            "sections": [
-                {
-                    "section_id": "SECTION_WATER",
-                    "name": "Water",
-                    "expected_items": ["bottled_drinks"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 64, "y1": 67, "x2": 283, "y2": 390},
-                    "priority": "Medium"
-                },
-                {
-                    "section_id": "SECTION_CANNED_DRINKS",
-                    "name": "Soda",
-                    "expected_items": ["canned_drinks"],
-                    "expected_count": 6,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 283, "y1": 209, "x2": 459, "y2": 392},
-                    "priority": "Medium"
-                },
-                {
-                    "section_id": "SECTION_LARGE_YOGURT",
-                    "name": "Large Yogurts",
-                    "expected_items": ["yogurt_cups_large"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 457, "y1": 209, "x2": 697, "y2": 392},
-                    "priority": "Medium"
-                },
-                {
-                    "section_id": "SECTION_SMALL_YOGURT",
-                    "name": "Small Yogurts",
-                    "expected_items": ["yogurt_cups_small"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 696, "y1": 208, "x2": 1006, "y2": 393},
-                    "priority": "Medium"
-                },
-                {
-                    "section_id": "SECTION_SALADS",
-                    "name": "Salads",
-                    "expected_items": ["salads_bowls"],
-                    "expected_count": 6,
-                    "expected_visible_count": 4,
-                    "position": {"x1": 48, "y1": 406, "x2": 640, "y2": 734},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_LARGE_PLATES",
-                    "name": "Large Plates",
-                    "expected_items": ["large_plates"],
-                    "expected_count": 6,
-                    "expected_visible_count": 3,
-                    "position": {"x1": 640, "y1": 406, "x2": 1001, "y2": 736},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_WRAPS",
-                    "name": "Wraps",
-                    "expected_items": ["wraps"],
-                    "expected_count": 6,
-                    "expected_visible_count": 4,
-                    "position": {"x1": 76, "y1": 764, "x2": 424, "y2": 1080},
-                    "priority": "Medium"
-                },
-                {
-                    "section_id": "SECTION_SANDWICHES",
-                    "name": "Sandwiches",
-                    "expected_items": ["sandwiches"],
-                    "expected_count": 4,
-                    "expected_visible_count": 2,
-                    "position": {"x1": 424, "y1": 764, "x2": 624, "y2": 1081},
-                    "priority": "High"
-                },
-                {
-                    "section_id": "SECTION_SMALL_PLATES",
-                    "name": "Small Plates",
-                    "expected_items": ["small_plates"],
-                    "expected_count": 6,
-                    "expected_visible_count": 3,
-                    "position": {"x1": 622, "y1": 764, "x2": 968, "y2": 1084},
-                    "priority": "High"
-                }
-            ]
-        }
-        
-        try:
-            os.makedirs(config_dir, exist_ok=True)
-            with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
-            print(f"✅ Created default store_005.json configuration")
+            for filename, default_config in _DEFAULT_CONFIGS.items():
+                if filename in existing:
+                    continue
+                _json_dump(default_config, os.path.join(config_dir, filename))
+                print(f"✅ Created default {filename} configuration")
+            
+            _defaults_initialized.add(config_dir)
         except Exception as e:
             print(f"❌ Error creating default config: {e}")
 
     @staticmethod
-    def list_available_configs(config_dir: Optional[str] = None) -> List[str]:
-        """List all available configuration files"""
+    def list_available_configs(
+        config_dir: Optional[str] = None,
+        return_paths: bool = False
+    ) -> Union[List[str], List[Tuple[str, str]]]:
+        """
+        List all available configuration files
+        
+        Args:
+            config_dir: Directory to scan (defaults to the deployment config directory)
+            return_paths: If True, return (filename, full_path) pairs so callers
+                don't have to rebuild paths with get_config_path
+        """
         if config_dir is None:
             config_dir = DeploymentConfig.get_config_dir()
         
-        if not os.path.exists(config_dir):
-            # Create the directory if it doesn't exist
-            os.makedirs(config_dir, exist_ok=True)
+        # Create the directory if it doesn't exist (no-op otherwise, no separate exists check)
+        os.makedirs(config_dir, exist_ok=True)
         
         # Ensure we have at least the default store_004.json and store_005.json
-        PlanogramConfig._create_default_store_004_config()
-        PlanogramConfig._create_default_store_005_config()
+        PlanogramConfig._ensure_default_configs()
         
         try:
             config_files = []
-            for filename in os.listdir(config_dir):
-                if filename.endswith('.json'):
-                    full_path = os.path.join(config_dir, filename)
-                    # Verify the file is readable
-                    try:
-                        with open(full_path, 'r') as f:
-                            json.load(f)
-                        config_files.append(filename)
-                    except Exception as e:
-                        # Log error but continue
-                        print(f"Warning: Invalid config file {filename}: {e}")
+            unchecked = []  # (name, path, (mtime_ns, size)) of new or modified files
+            with os.scandir(config_dir) as entries:
+                for entry in entries:
+                    # Cheap name check first; is_file() is served from the DirEntry cache
+                    if not entry.name.endswith('.json') or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    key = (stat.st_mtime_ns, stat.st_size)
+                    cached = _CONFIG_VALIDITY_CACHE.get(entry.path)
+                    if cached is not None and cached[:2] == key:
+                        if cached[2]:
+                            config_files.append((entry.name, entry.path))
+                    else:
+                        unchecked.append((entry.name, entry.path, key))
+            
+            # Verify new/modified files are readable; independent files parse in parallel
+            names = [name for name, _, _ in unchecked]
+            paths = [path for _, path, _ in unchecked]
+            if len(unchecked) > _PARALLEL_VALIDATION_MIN_FILES:
+                with ThreadPoolExecutor(max_workers=min(8, len(unchecked))) as executor:
+                    results = list(executor.map(PlanogramConfig._is_readable_config, names, paths))
+            else:
+                results = [PlanogramConfig._is_readable_config(name, path) for name, path in zip(names, paths)]
             
-            return sorted(config_files)
+            for (name, path, key), is_valid in zip(unchecked, results):
+                _CONFIG_VALIDITY_CACHE[path] = (key[0], key[1], is_valid)
+                if is_valid:
+                    config_files.append((name, path))
+            
+            config_files.sort()
+            if return_paths:
+                return config_files
+            return [name for name, _ in config_files]
             
         except Exception as e:
             print(f"Error reading config directory {config_dir}: {e}")
             return []
     
+    @staticmethod
+    def _is_readable_config(name: str, path: str) -> bool:
+        """Check that a config file parses as JSON"""
+        try:
+            _json_load(path)
+            return True
+        except Exception as e:
+            # Log error but continue
+            print(f"Warning: Invalid config file {name}: {e}")
+            return False
+    
     @staticmethod
     def get_config_path(config_name: str, config_dir: Optional[str] = None) -> str:
         """Get full path for a configuration file"""
@@ -494,25 +733,32 @@ class PlanogramConfig:
         if not self.sections:
             issues.append("No sections defined in configuration")
         
+        # Duplicates can only come from a loaded file (add_section rejects them);
+        # the id index holds one entry per unique id, so sizes differ only then
+        check_duplicates = len(self._by_id) != len(self.sections)
         section_ids = set()
         for section in self.sections:
+            section_id = section.section_id
+            expected_count = section.expected_count
+            bbox = section.position
+            
             # Check for duplicate IDs
-            if section.section_id in section_ids:
-                issues.append(f"Duplicate section ID: {section.section_id}")
-            section_ids.add(section.section_id)
+            if check_duplicates:
+                if section_id in section_ids:
+                    issues.append(f"Duplicate section ID: {section_id}")
+                section_ids.add(section_id)
             
             # Check for empty expected items
             if not section.expected_items:
-                issues.append(f"Section '{section.section_id}' has no expected items")
+                issues.append(f"Section '{section_id}' has no expected items")
             
             # Check for invalid expected count
-            if section.expected_count <= 0:
-                issues.append(f"Section '{section.section_id}' has invalid expected count: {section.expected_count}")
+            if expected_count <= 0:
+                issues.append(f"Section '{section_id}' has invalid expected count: {expected_count}")
             
             # Check for invalid bounding box
-            bbox = section.position
             if bbox.x1 >= bbox.x2 or bbox.y1 >= bbox.y2:
-                issues.append(f"Section '{section.section_id}' has invalid bounding box")
+                issues.append(f"Section '{section_id}' has invalid bounding box")
         
         return issues
     
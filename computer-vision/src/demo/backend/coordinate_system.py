@@ -10,7 +10,10 @@ This module provides consistent coordinate transformations across:
 All coordinates are stored in a normalized format and transformed as needed.
 """
 
-from typing import Tuple, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Tuple, Dict, Any, List, Mapping
+import numpy as np
 from PIL import Image
 from .models import BoundingBox
 
@@ -34,7 +37,7 @@ class CoordinateSystem:
         return cls.REFERENCE_WIDTH, cls.REFERENCE_HEIGHT
     
     @classmethod
-    def image_to_reference_transform(cls, image: Image.Image) -> Dict[str, Any]:
+    def image_to_reference_transform(cls, image: Image.Image) -> Mapping[str, Any]:
         """
         Calculate transformation parameters from original image to reference format.
         
@@ -42,7 +45,7 @@ class CoordinateSystem:
             image: Original PIL Image
             
         Returns:
-            Dictionary with transformation parameters:
+            Read-only mapping with transformation parameters (shared, cached per image size):
             {
                 'scale': float,          # Scaling factor applied
                 'offset_x': int,         # X offset for centering
@@ -51,8 +54,12 @@ class CoordinateSystem:
                 'scaled_height': int,    # Height after scaling
             }
         """
-        original_width, original_height = image.size
-        
+        return cls._transform_from_size(*image.size)
+    
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _transform_from_size(cls, original_width: int, original_height: int) -> Mapping[str, Any]:
+        """Compute the original -> reference transform for an image size (memoized)"""
         # Calculate scaling factor (same as annotator logic)
         scale_w = cls.REFERENCE_WIDTH / original_width
         scale_h = cls.REFERENCE_HEIGHT / original_height
@@ -66,7 +73,7 @@ class CoordinateSystem:
         offset_x = (cls.REFERENCE_WIDTH - scaled_width) // 2
         offset_y = (cls.REFERENCE_HEIGHT - scaled_height) // 2
         
-        return {
+        return MappingProxyType({
             'scale': scale,
             'offset_x': offset_x,
             'offset_y': offset_y,
@@ -74,7 +81,7 @@ class CoordinateSystem:
             'scaled_height': scaled_height,
             'original_width': original_width,
             'original_height': original_height
-        }
+        })
     
     @classmethod
     def original_to_reference(cls, bbox: BoundingBox, image: Image.Image) -> BoundingBox:
@@ -88,7 +95,7 @@ class CoordinateSystem:
         Returns:
             BoundingBox in reference coordinate system
         """
-        transform = cls.image_to_reference_transform(image)
+        transform = cls._transform_from_size(*image.size)
         
         # Apply scaling and offset
         x1 = int(bbox.x1 * transform['scale']) + transform['offset_x']
@@ -110,15 +117,44 @@ class CoordinateSystem:
         Returns:
             BoundingBox in original image coordinate system
         """
-        transform = cls.image_to_reference_transform(image)
+        return BoundingBox(*cls.reference_to_original_tuple(bbox.x1, bbox.y1, bbox.x2, bbox.y2, image))
+    
+    @classmethod
+    def reference_to_original_tuple(cls, x1: float, y1: float, x2: float, y2: float,
+                                    image: Image.Image) -> Tuple[int, int, int, int]:
+        """
+        Same as reference_to_original, but takes and returns raw coordinates.
+        Use when only the numbers are needed (e.g. drawing), to skip BoundingBox allocation.
+        
+        Args:
+            x1, y1, x2, y2: Coordinates in reference space
+            image: Original PIL Image for transformation calculation
+            
+        Returns:
+            (x1, y1, x2, y2) in original image coordinate system
+        """
+        return cls._ref_to_orig_tuple(x1, y1, x2, y2, cls._transform_from_size(*image.size))
+    
+    @staticmethod
+    def _ref_to_orig_tuple(x1: float, y1: float, x2: float, y2: float,
+                           transform: Mapping[str, Any]) -> Tuple[int, int, int, int]:
+        """Reference -> original arithmetic for a precomputed transform"""
+        offset_x = transform['offset_x']
+        offset_y = transform['offset_y']
         
-        # Remove offset and reverse scaling
-        x1 = (bbox.x1 - transform['offset_x']) / transform['scale']
-        y1 = (bbox.y1 - transform['offset_y']) / transform['scale']
-        x2 = (bbox.x2 - transform['offset_x']) / transform['scale']
-        y2 = (bbox.y2 - transform['offset_y']) / transform['scale']
+        # Identity transform (image already in reference format): nothing to undo
+        if transform['scale'] == 1 and offset_x == 0 and offset_y == 0:
+            return int(x1), int(y1), int(x2), int(y2)
         
-        return BoundingBox(int(x1), int(y1), int(x2), int(y2))
+        # Remove offset and reverse scaling (divide, not multiply by 1 / scale, so the
+        # int() truncation lands on the same pixel)
+        scale = transform['scale']
+        return (
+            int((x1 - offset_x) / scale),
+            int((y1 - offset_y) / scale),
+            int((x2 - offset_x) / scale),
+            int((y2 - offset_y) / scale)
+        )
     
     @classmethod
     def canvas_to_reference(cls, canvas_coords: Dict[str, int], 
@@ -136,22 +172,22 @@ class CoordinateSystem:
             BoundingBox in reference coordinate system
         """
         canvas_width, canvas_height = canvas_size
-        original_width, original_height = original_image.size
+        transform = cls._transform_from_size(*original_image.size)
         
-        # First convert canvas coordinates to original image coordinates
-        scale_x = original_width / canvas_width
-        scale_y = original_height / canvas_height
+        # Canvas -> original -> reference in one pass, without an intermediate BoundingBox.
+        # Both stages keep their int() truncation so results match the two-step conversion.
+        scale_x = transform['original_width'] / canvas_width
+        scale_y = transform['original_height'] / canvas_height
+        scale = transform['scale']
+        offset_x = transform['offset_x']
+        offset_y = transform['offset_y']
         
-        orig_x1 = canvas_coords['x1'] * scale_x
-        orig_y1 = canvas_coords['y1'] * scale_y
-        orig_x2 = canvas_coords['x2'] * scale_x
-        orig_y2 = canvas_coords['y2'] * scale_y
-        
-        # Create bbox in original coordinates
-        orig_bbox = BoundingBox(int(orig_x1), int(orig_y1), int(orig_x2), int(orig_y2))
-        
-        # Convert to reference coordinates
-        return cls.original_to_reference(orig_bbox, original_image)
+        return BoundingBox(
+            int(int(canvas_coords['x1'] * scale_x) * scale) + offset_x,
+            int(int(canvas_coords['y1'] * scale_y) * scale) + offset_y,
+            int(int(canvas_coords['x2'] * scale_x) * scale) + offset_x,
+            int(int(canvas_coords['y2'] * scale_y) * scale) + offset_y
+        )
     
     @classmethod
     def normalize_detection_coordinates(cls, detections: list, analysis_image: Image.Image) -> list:
@@ -165,40 +201,71 @@ class CoordinateSystem:
         Returns:
             List of detections with coordinates normalized to reference system
         """
-        normalized_detections = []
+        if not detections:
+            return []
+        
+        # The transform depends only on the image, so compute it once for all detections
+        transform = cls._transform_from_size(*analysis_image.size)
+        scale = transform['scale']
+        offsets = np.array([transform['offset_x'], transform['offset_y']] * 2, dtype=np.int64)
         
-        for detection in detections:
-            # Create BoundingBox from YOLO coordinates (already in original image space)
-            bbox_coords = detection['bbox']
-            orig_bbox = BoundingBox(
-                int(bbox_coords[0]), int(bbox_coords[1]), 
-                int(bbox_coords[2]), int(bbox_coords[3])
+        # Gather: a single pass over the detection dicts stages bboxes and polygon vertices
+        # as arrays. YOLO bbox coordinates (original image space) are truncated to pixels,
+        # as original_to_reference expects.
+        bboxes = np.empty((len(detections), 4), dtype=np.float64)
+        has_polygon = [False] * len(detections)
+        polygons = []
+        for i, detection in enumerate(detections):
+            bboxes[i] = detection['bbox'][:4]
+            polygon = detection.get('mask_polygon')
+            if polygon is not None and len(polygon) > 0:
+                polygon = np.asarray(polygon, dtype=np.float64)
+                polygons.append(polygon.reshape(len(polygon), -1)[:, :2])
+                has_polygon[i] = True
+        np.trunc(bboxes, out=bboxes)
+        
+        # Transform: vectorized affine over all bboxes and all polygon vertices.
+        # astype() truncates toward zero exactly like int().
+        width, height = transform['original_width'], transform['original_height']
+        xs, ys = bboxes[:, 0::2], bboxes[:, 1::2]
+        if xs.min() >= 0 and xs.max() <= width and ys.min() >= 0 and ys.max() <= height:
+            # In-bounds integer pixels: map through the cached per-size lookup tables
+            lut_x, lut_y = _pixel_to_reference_luts(
+                width, height, scale, transform['offset_x'], transform['offset_y']
             )
-            
-            # Convert to reference coordinates
-            ref_bbox = cls.original_to_reference(orig_bbox, analysis_image)
-            
-            # Create normalized detection
-            normalized_detection = detection.copy()
-            normalized_detection['bbox'] = [ref_bbox.x1, ref_bbox.y1, ref_bbox.x2, ref_bbox.y2]
-            normalized_detection['original_bbox'] = bbox_coords  # Keep original for reference
-            
-            # Handle mask coordinates if present
-            if 'mask_polygon' in detection and detection['mask_polygon']:
-                normalized_polygon = []
-                transform = cls.image_to_reference_transform(analysis_image)
-                
-                for point in detection['mask_polygon']:
-                    if len(point) >= 2:
-                        # Convert polygon points to reference coordinates
-                        ref_x = int(point[0] * transform['scale']) + transform['offset_x']
-                        ref_y = int(point[1] * transform['scale']) + transform['offset_y']
-                        normalized_polygon.append([ref_x, ref_y])
-                
-                normalized_detection['mask_polygon'] = normalized_polygon
-                normalized_detection['original_mask_polygon'] = detection['mask_polygon']
-            
-            normalized_detections.append(normalized_detection)
+            ref_bboxes = np.empty(bboxes.shape, dtype=np.int64)
+            ref_bboxes[:, 0::2] = lut_x[xs.astype(np.intp)]
+            ref_bboxes[:, 1::2] = lut_y[ys.astype(np.intp)]
+            ref_bboxes = ref_bboxes.tolist()
+        else:
+            ref_bboxes = ((bboxes * scale).astype(np.int64) + offsets).tolist()
+        
+        ref_polygons = iter(())
+        if polygons:
+            ref_points = (np.concatenate(polygons) * scale).astype(np.int64) + offsets[:2]
+            # One tolist() over all vertices, then slice per polygon: list slicing is
+            # cheaper than np.split views plus a tolist() call per polygon
+            ref_points = ref_points.tolist()
+            ends = np.cumsum([len(polygon) for polygon in polygons]).tolist()
+            ref_polygons = (ref_points[start:end] for start, end in zip([0] + ends, ends))
+        
+        # Scatter: build the normalized detections (original coordinates kept for reference)
+        normalized_detections = [None] * len(detections)
+        for i, detection in enumerate(detections):
+            if has_polygon[i]:
+                normalized_detections[i] = {
+                    **detection,
+                    'bbox': ref_bboxes[i],
+                    'original_bbox': detection['bbox'],
+                    'mask_polygon': next(ref_polygons),
+                    'original_mask_polygon': detection['mask_polygon']
+                }
+            else:
+                normalized_detections[i] = {
+                    **detection,
+                    'bbox': ref_bboxes[i],
+                    'original_bbox': detection['bbox']
+                }
         
         return normalized_detections
     
@@ -219,4 +286,70 @@ class CoordinateSystem:
             return bbox
         
         # Otherwise, convert from reference to display coordinates
-        return cls.reference_to_original(bbox, display_image) 
\ No newline at end of file
+        return cls.reference_to_original(bbox, display_image)
+    
+    @classmethod
+    def get_display_coordinates_batch(cls, bboxes: List[BoundingBox],
+                                      display_image: Image.Image) -> List[BoundingBox]:
+        """
+        Vectorized get_display_coordinates for many boxes on the same display image.
+        The transform is looked up once and applied to all boxes in one NumPy pass.
+        
+        Args:
+            bboxes: BoundingBoxes in reference coordinates
+            display_image: The image being displayed/annotated
+            
+        Returns:
+            BoundingBoxes in display image coordinates, in the same order
+        """
+        # If display image is already in reference format, return as-is
+        if not bboxes or display_image.size == (cls.REFERENCE_WIDTH, cls.REFERENCE_HEIGHT):
+            return list(bboxes)
+        
+        transform = cls._transform_from_size(*display_image.size)
+        offsets = np.array([transform['offset_x'], transform['offset_y']] * 2, dtype=np.float64)
+        coords = BoundingBox.stack(bboxes)
+        
+        # Same arithmetic as reference_to_original; astype() truncates like int()
+        display_coords = ((coords - offsets) / transform['scale']).astype(np.int64)
+        return [BoundingBox(*row) for row in display_coords.tolist()]
+    
+    @classmethod
+    def reference_to_original_points(cls, points: np.ndarray, image: Image.Image) -> np.ndarray:
+        """
+        Vectorized reference_to_original for polygon vertices.
+        All points are transformed in one NumPy pass instead of one call per vertex.
+        
+        Args:
+            points: (N, 2) array of x, y in reference coordinates
+            image: Original PIL Image for transformation calculation
+            
+        Returns:
+            (N, 2) int64 array in original image coordinates
+        """
+        points = np.asarray(points, dtype=np.float64)
+        transform = cls._transform_from_size(*image.size)
+        offset_x = transform['offset_x']
+        offset_y = transform['offset_y']
+        
+        # Identity transform (image already in reference format): only truncate
+        if transform['scale'] == 1 and offset_x == 0 and offset_y == 0:
+            return points.astype(np.int64)
+        
+        # Same arithmetic as reference_to_original; astype() truncates like int()
+        offsets = np.array([offset_x, offset_y], dtype=np.float64)
+        return ((points - offsets) / transform['scale']).astype(np.int64)
+
+
+@lru_cache(maxsize=8)
+def _pixel_to_reference_luts(width: int, height: int, scale: float,
+                              offset_x: int, offset_y: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lookup tables mapping integer pixel coordinates of a width x height image to
+    reference coordinates (index i -> int(i * scale) + offset), one per axis.
+    Sized width + 1 / height + 1 so right/bottom edges are covered. Cached since a
+    camera stream analyzes many frames of the same size.
+    """
+    lut_x = (np.arange(width + 1, dtype=np.float64) * scale).astype(np.int64) + offset_x
+    lut_y = (np.arange(height + 1, dtype=np.float64) * scale).astype(np.int64) + offset_y
+    return lut_x, lut_y
@@ -1,9 +1,13 @@
+import logging
 import os
 import numpy as np
 from PIL import Image
 from typing import List, Dict, Any, Optional, Tuple
 from ultralytics import YOLO
 from .config import DeploymentConfig
+from .models import pack_mask, unpack_mask, packed_mask_area
+
+logger = logging.getLogger(__name__)
 
 class ModelInference:
     """Model inference layer for planogram analysis"""
@@ -17,20 +21,52 @@ class ModelInference:
             weights_path: Path to model weights file (optional, uses deployment config if not provided)
         """
         self.model = None
+        self.device = 'cpu'
+        self.half = False
         # Use deployment config for weights path or provided path
         self.weights_path = weights_path or DeploymentConfig.get_model_weights_path()
         self._load_model()
     
+    @staticmethod
+    def _resolve_device() -> str:
+        """Resolve the configured inference device, falling back to CPU without CUDA"""
+        device = DeploymentConfig.get_inference_device()
+        if device != 'auto':
+            return device
+        try:
+            import torch
+            return '0' if torch.cuda.is_available() else 'cpu'
+        except Exception:
+            return 'cpu'
+    
     def _load_model(self) -> None:
         """Load the model from weights file"""
         try:
-            # Load the model using Ultralytics
+            # Load the model using Ultralytics (.pt weights or an exported TensorRT .engine)
             self.model = YOLO(self.weights_path)
-            print(f"✅ Model loaded successfully from: {self.weights_path}")
-            
+            self.device = self._resolve_device()
+            # FP16 only pays off on CUDA; CPU inference stays in FP32
+            self.half = self.device != 'cpu'
         except Exception as e:
             print(f"❌ Error loading model: {e}")
             self.model = None
+            return
+        
+        # Fusing and warming up are only optimizations: if either fails, keep the
+        # loaded model rather than discarding it
+        try:
+            if self.weights_path.endswith('.pt'):
+                # Fold Conv+BatchNorm layers once instead of on the first request
+                self.model.fuse()
+            
+            # Warm-up pass so device placement and kernel selection happen at load time
+            self.model(np.zeros((640, 640, 3), dtype=np.uint8),
+                       device=self.device, half=self.half, verbose=False)
+        except Exception as e:
+            logger.warning("Model fuse/warm-up failed, continuing without it: %s", e)
+        
+        print(f"✅ Model loaded successfully from: {self.weights_path} "
+              f"(device: {self.device}, half: {self.half})")
     
     def infer(self, image: Image.Image, confidence_threshold: float = 0.5, 
               iou_threshold: float = 0.4) -> List[Dict[str, Any]]:
@@ -49,114 +85,145 @@ class ModelInference:
                 'class_name': str,
                 'confidence': float,
                 'bbox': [x1, y1, x2, y2],
-                'mask': numpy.ndarray,  # Binary mask (height, width)
-                'mask_polygon': List[List[float]]  # Polygon coordinates [[x1, y1], [x2, y2], ...]
+                'mask': numpy.ndarray,  # Bit-packed binary mask (height, ceil(width / 8)) uint8
+                'mask_shape': (height, width),  # Unpacked mask shape, see unpack_mask()
+                'mask_polygon': numpy.ndarray  # (V, 2) float32 polygon coordinates, or [] if none
             }
         """
+        batch_detections = self.infer_batch([image], confidence_threshold, iou_threshold)
+        return batch_detections[0] if batch_detections else []
+    
+    def infer_batch(self, images: List[Image.Image], confidence_threshold: float = 0.5,
+                    iou_threshold: float = 0.4) -> List[List[Dict[str, Any]]]:
+        """
+        Run inference on several images in a single model call
+        
+        Args:
+            images: PIL Images to analyze
+            confidence_threshold: Minimum confidence score for detections
+            iou_threshold: IoU threshold for non-maximum suppression
+            
+        Returns:
+            One list of detection dictionaries per input image, in input order
+            (same format as infer())
+        """
         if self.model is None:
             print("⚠️ Model not loaded, returning empty results")
+            return [[] for _ in images]
+        if not images:
             return []
         
         try:
-            # Run inference using Ultralytics
-            results = self.model(image, 
+            # One batched call amortizes preprocessing and kernel launches over all images
+            results = self.model(images,
                                conf=confidence_threshold,
                                iou=iou_threshold,
+                               device=self.device,
+                               half=self.half,
                                verbose=False)
             
-            # Process results
-            detections = []
+            batch_detections = [self._postprocess(result) for result in results]
             
-            # Process the first result (single image)
-            if len(results) > 0:
-                result = results[0]
-                
-                # Get bounding boxes, confidences, and classes
-                if result.boxes is not None:
-                    boxes = result.boxes.xyxy.cpu().numpy()  # x1, y1, x2, y2 format
-                    confidences = result.boxes.conf.cpu().numpy()
-                    classes = result.boxes.cls.cpu().numpy()
-                    
-                    # Get class names
-                    names = result.names
-                    
-                    # Get segmentation masks if available
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Inference completed: %d detections found in %d image(s)",
+                            sum(map(len, batch_detections)), len(images))
+            
+            # Per-detection dump for debugging; skipped entirely unless DEBUG is enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                for detections in batch_detections:
+                    for i, detection in enumerate(detections):
+                        mask_info = ""
+                        if detection['mask'] is not None:
+                            mask_info = f", Mask: {detection['mask_shape']}, Polygon points: {len(detection['mask_polygon'])}"
+                        
+                        logger.debug(f"  {i+1}. {detection['class_name']} (ID: {detection['class_id']}) - "
+                                     f"Confidence: {detection['confidence']:.3f}, "
+                                     f"BBox: {detection['bbox']}{mask_info}")
+            
+            return batch_detections
+            
+        except Exception as e:
+            print(f"❌ Error during inference: {e}")
+            return [[] for _ in images]
+    
+    def _postprocess(self, result) -> List[Dict[str, Any]]:
+        """Convert a single Ultralytics result into detection dictionaries"""
+        detections = []
+        
+        # Get bounding boxes, confidences, and classes
+        if result.boxes is not None:
+            # Single device->host transfer of the packed box tensor:
+            # columns are x1, y1, x2, y2, [track_id,] conf, cls
+            box_data = result.boxes.data.cpu().numpy()
+            boxes = box_data[:, :4].tolist()  # x1, y1, x2, y2 format
+            confidences = box_data[:, -2].tolist()
+            classes = box_data[:, -1].astype(int).tolist()
+            
+            # Get class names
+            names = result.names
+            
+            # Get segmentation masks if available
+            masks_data = None
+            masks_xy = None
+            if result.masks is not None:
+                try:
+                    # Binarize on device so only 1 byte/pixel crosses to the host
+                    # (float32 masks are 4); the bool buffer is then reinterpreted
+                    # as uint8 {0, 1} without another copy
+                    masks_data = result.masks.data.gt(0).cpu().numpy().view(np.uint8)  # Binary masks
+                    # Bit-pack all masks in one call: 8 pixels per byte for storage
+                    masks_data = pack_mask(masks_data)
+                    mask_shape = tuple(result.masks.data.shape[-2:])
+                    masks_xy = result.masks.xy  # Polygon coordinates
+                    logger.debug("Found %d segmentation masks", len(masks_data))
+                except Exception as e:
+                    print(f"⚠️ Error processing masks: {e}")
                     masks_data = None
                     masks_xy = None
-                    if result.masks is not None:
-                        try:
-                            masks_data = result.masks.data.cpu().numpy()  # Binary masks
-                            masks_xy = result.masks.xy  # Polygon coordinates
-                            print(f"🎭 Found {len(masks_data)} segmentation masks")
-                        except Exception as e:
-                            print(f"⚠️ Error processing masks: {e}")
-                            masks_data = None
-                            masks_xy = None
-                    
-                    # Create detection dictionaries
-                    for i, (box, conf, cls) in enumerate(zip(boxes, confidences, classes)):
-                        class_id = int(cls)
-                        class_name = names.get(class_id, f'unknown_class_{class_id}')
-                        
-                        detection = {
-                            'class_id': class_id,
-                            'class_name': class_name,
-                            'confidence': float(conf),
-                            'bbox': [float(box[0]), float(box[1]), float(box[2]), float(box[3])]
-                        }
+            
+            # Create detection dictionaries
+            for i, (box, conf, class_id) in enumerate(zip(boxes, confidences, classes)):
+                class_name = names.get(class_id, f'unknown_class_{class_id}')
+                
+                detection = {
+                    'class_id': class_id,
+                    'class_name': class_name,
+                    'confidence': conf,
+                    'bbox': box
+                }
+                
+                # Add mask data if available
+                if masks_data is not None and i < len(masks_data):
+                    try:
+                        # Bit-packed binary mask (a view into the packed batch)
+                        detection['mask'] = masks_data[i]
+                        detection['mask_shape'] = mask_shape
                         
-                        # Add mask data if available
-                        if masks_data is not None and i < len(masks_data):
-                            try:
-                                # Binary mask
-                                detection['mask'] = masks_data[i].astype(np.uint8)
-                                
-                                # Polygon coordinates
-                                if masks_xy is not None and i < len(masks_xy):
-                                    # Convert polygon to list of [x, y] coordinates
-                                    polygon = masks_xy[i]
-                                    # Handle both tensor and numpy array cases
-                                    if hasattr(polygon, 'cpu'):
-                                        polygon = polygon.cpu().numpy()
-                                    elif not isinstance(polygon, np.ndarray):
-                                        polygon = np.array(polygon)
-                                    detection['mask_polygon'] = polygon.tolist()
-                                else:
-                                    detection['mask_polygon'] = []
-                                
-                                print(f"  📐 Instance {i}: mask shape {detection['mask'].shape}, "
-                                      f"polygon points: {len(detection['mask_polygon'])}")
-                            except Exception as e:
-                                print(f"⚠️ Error processing mask for instance {i}: {e}")
-                                detection['mask'] = None
-                                detection['mask_polygon'] = []
+                        # Polygon coordinates
+                        if masks_xy is not None and i < len(masks_xy):
+                            # Keep polygon as a contiguous (V, 2) float32 array
+                            polygon = masks_xy[i]
+                            # Handle both tensor and numpy array cases
+                            if hasattr(polygon, 'cpu'):
+                                polygon = polygon.cpu().numpy()
+                            elif not isinstance(polygon, np.ndarray):
+                                polygon = np.array(polygon)
+                            detection['mask_polygon'] = polygon.astype(np.float32, copy=False) if len(polygon) else []
                         else:
-                            detection['mask'] = None
                             detection['mask_polygon'] = []
-                        
-                        detections.append(detection)
-            
-            print(f"🔍 Inference completed: {len(detections)} detections found")
-            
-            # Print detections for debugging
-            if detections:
-                print("📋 Detections found:")
-                for i, detection in enumerate(detections):
-                    mask_info = ""
-                    if detection['mask'] is not None:
-                        mask_info = f", Mask: {detection['mask'].shape}, Polygon points: {len(detection['mask_polygon'])}"
-                    
-                    print(f"  {i+1}. {detection['class_name']} (ID: {detection['class_id']}) - "
-                          f"Confidence: {detection['confidence']:.3f}, "
-                          f"BBox: {detection['bbox']}{mask_info}")
-            else:
-                print("📋 No detections found")
+                    except Exception as e:
+                        print(f"⚠️ Error processing mask for instance {i}: {e}")
+                        detection['mask'] = None
+                        detection['mask_shape'] = None
+                        detection['mask_polygon'] = []
+                else:
+                    detection['mask'] = None
+                    detection['mask_shape'] = None
+                    detection['mask_polygon'] = []
                 
-            return detections
-            
-        except Exception as e:
-            print(f"❌ Error during inference: {e}")
-            return []
+                detections.append(detection)
+        
+        return detections
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model"""
@@ -166,7 +233,9 @@ class ModelInference:
         info = {
             'status': 'loaded',
             'weights_path': self.weights_path,
-            'model_type': 'Ultralytics YOLO'
+            'model_type': 'Ultralytics YOLO',
+            'device': self.device,
+            'half': self.half
         }
         
         # Add class names if available
@@ -179,25 +248,28 @@ class ModelInference:
         """Check if the model is loaded and ready for inference"""
         return self.model is not None
     
-    def extract_masked_object(self, image: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    def extract_masked_object(self, image: np.ndarray, mask: np.ndarray,
+                              mask_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
         """
         Extract object pixels using the segmentation mask
         
         Args:
             image: Original image as numpy array (H, W, C)
-            mask: Binary mask as numpy array (H, W)
+            mask: Binary (H, W) mask, or the bit-packed mask returned by infer()
+            mask_shape: Unpacked (H, W) of a bit-packed mask (defaults to the image's)
             
         Returns:
             Masked object as numpy array with same shape as input image
         """
         if mask is None:
             return image
+        if mask_shape is not None or mask.shape[-1] != image.shape[1]:
+            # Bit-packed rows as returned by infer(): restore one value per pixel
+            mask = unpack_mask(mask, mask_shape or image.shape[:2])
         
-        # Ensure mask is the right shape and type
-        mask = mask.astype(np.uint8)
-        
-        # Apply mask to image (multiply each channel)
-        masked_object = image * mask[:, :, np.newaxis]
+        # Copy only the masked pixels into a zeroed buffer (no full-image multiply pass)
+        masked_object = np.zeros_like(image)
+        np.copyto(masked_object, image, where=mask.astype(bool, copy=False)[:, :, np.newaxis])
         
         return masked_object
     
@@ -206,37 +278,35 @@ class ModelInference:
         Calculate the area of a segmentation mask
         
         Args:
-            mask: Binary mask as numpy array
+            mask: Binary (H, W) mask of 0/1 values, or the bit-packed mask returned by infer()
             
         Returns:
             Area in pixels
         """
         if mask is None:
             return 0.0
+        if mask.dtype == np.uint8:
+            # uint8 masks are either bit-packed rows or one 0/1 byte per pixel; a popcount
+            # over the bytes counts the set pixels exactly in both cases, no unpack pass
+            return float(packed_mask_area(mask))
         
-        return float(np.sum(mask))
+        # Boolean or float mask: counting set pixels is cheaper than a full sum
+        return float(np.count_nonzero(mask))
     
-    def get_mask_perimeter(self, mask_polygon: List[List[float]]) -> float:
+    def get_mask_perimeter(self, mask_polygon) -> float:
         """
         Calculate the perimeter of a mask using polygon coordinates
         
         Args:
-            mask_polygon: List of [x, y] coordinates
+            mask_polygon: (V, 2) array or list of [x, y] coordinates
             
         Returns:
             Perimeter in pixels
         """
-        if not mask_polygon or len(mask_polygon) < 3:
+        if mask_polygon is None or len(mask_polygon) < 3:
             return 0.0
         
-        perimeter = 0.0
-        for i in range(len(mask_polygon)):
-            p1 = mask_polygon[i]
-            p2 = mask_polygon[(i + 1) % len(mask_polygon)]
-            
-            # Calculate Euclidean distance
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            perimeter += np.sqrt(dx*dx + dy*dy)
-        
-        return perimeter 
\ No newline at end of file
+        # Sum of edge lengths, including the closing edge back to the first vertex
+        points = np.asarray(mask_polygon, dtype=np.float64)[:, :2]
+        edges = np.roll(points, -1, axis=0) - points
+        return float(np.hypot(edges[:, 0], edges[:, 1]).sum()) 
\ No newline at end of file
@@ -1,55 +1,130 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Tuple
+import sys
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import attrgetter
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 import pandas as pd
 from PIL import Image
 import numpy as np
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10+; on older interpreters the classes keep a
+# per-instance __dict__ (BoundingBox, the most numerous, declares its slots by hand)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Set-bit count for every byte value, used to measure bit-packed masks without unpacking
+_BYTE_BIT_COUNTS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1)
+# Native popcount ufunc (NumPy 2.0+); the lookup table covers older versions
+_bitwise_count = getattr(np, 'bitwise_count', None)
+
+# Task fields in DataFrame column order (matches Task.to_dict)
+_TASK_COLUMNS = ('task_id', 'description', 'section_id', 'priority', 'task_type', 'estimated_time')
+_get_task_fields = attrgetter(*_TASK_COLUMNS)
+
+
+def pack_mask(mask: np.ndarray) -> np.ndarray:
+    """Bit-pack a binary (H, W) mask along its rows (8 pixels per byte)"""
+    return np.packbits(mask.astype(bool, copy=False), axis=-1)
+
+
+def unpack_mask(packed: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Restore a uint8 {0, 1} (H, W) mask from its bit-packed rows"""
+    return np.unpackbits(packed, axis=-1, count=shape[-1])
+
+
+def packed_mask_area(packed: np.ndarray) -> int:
+    """Count set pixels in a bit-packed mask (row padding bits are always zero)"""
+    if _bitwise_count is not None:
+        return int(_bitwise_count(packed).sum(dtype=np.int64))
+    return int(_BYTE_BIT_COUNTS[packed].sum())
+
+
+@dataclass(frozen=True)
 class BoundingBox:
-    """Represents a bounding box for detected objects"""
+    """Represents a bounding box for detected objects (immutable; build a new box to move one)"""
+    # Explicit slots (dataclass(slots=True) needs Python 3.10+): one is created per
+    # detection, section and transformed point, so skipping the instance __dict__ matters
+    __slots__ = ('x1', 'y1', 'x2', 'y2', '_center', '_area')
+    
     x1: float
     y1: float
     x2: float
     y2: float
     
+    def __post_init__(self):
+        # Frozen, so the derived values can be computed once instead of on every
+        # property access (object.__setattr__ bypasses the frozen guard)
+        object.__setattr__(self, '_center', ((self.x1 + self.x2) / 2, (self.y1 + self.y2) / 2))
+        object.__setattr__(self, '_area', (self.x2 - self.x1) * (self.y2 - self.y1))
+    
+    # Slotted frozen instances need explicit state hooks to survive copy and pickle
+    def __getstate__(self) -> Tuple[float, float, float, float]:
+        return (self.x1, self.y1, self.x2, self.y2)
+    
+    def __setstate__(self, state: Tuple[float, float, float, float]) -> None:
+        for name, value in zip(('x1', 'y1', 'x2', 'y2'), state):
+            object.__setattr__(self, name, value)
+        self.__post_init__()
+    
     @property
     def center(self) -> Tuple[float, float]:
         """Get the center point of the bounding box"""
-        return ((self.x1 + self.x2) / 2, (self.y1 + self.y2) / 2)
+        return self._center
     
     @property
     def area(self) -> float:
         """Calculate the area of the bounding box"""
-        return (self.x2 - self.x1) * (self.y2 - self.y1)
+        return self._area
     
     def iou(self, other: 'BoundingBox') -> float:
         """Calculate Intersection over Union with another bounding box"""
-        # Calculate intersection
-        x1_inter = max(self.x1, other.x1)
-        y1_inter = max(self.y1, other.y1)
-        x2_inter = min(self.x2, other.x2)
-        y2_inter = min(self.y2, other.y2)
-        
-        if x1_inter < x2_inter and y1_inter < y2_inter:
-            intersection = (x2_inter - x1_inter) * (y2_inter - y1_inter)
-        else:
-            intersection = 0.0
+        # Calculate intersection (clamped to zero when the boxes do not overlap)
+        inter_width = max(0.0, min(self.x2, other.x2) - max(self.x1, other.x1))
+        inter_height = max(0.0, min(self.y2, other.y2) - max(self.y1, other.y1))
+        intersection = inter_width * inter_height
         
         # Calculate union
-        union = self.area + other.area - intersection
+        union = self._area + other._area - intersection
         
         return intersection / union if union > 0 else 0.0
+    
+    @staticmethod
+    def stack(boxes: List['BoundingBox'], dtype=np.float64) -> np.ndarray:
+        """
+        Pack boxes into one contiguous (N, 4) array of x1, y1, x2, y2 for vectorized
+        box math, filled straight from the attributes
+        """
+        coords = chain.from_iterable((box.x1, box.y1, box.x2, box.y2) for box in boxes)
+        return np.fromiter(coords, dtype=dtype, count=4 * len(boxes)).reshape(len(boxes), 4)
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DetectedItem:
-    """Represents a detected item from YOLO model with segmentation masks"""
+    """
+    Represents a detected item from YOLO model with segmentation masks.
+    
+    ``mask`` is stored bit-packed: an unpacked (H, W) mask passed in is packed on
+    construction and its shape recorded in ``mask_shape``. Use get_unpacked_mask()
+    for the (H, W) array of 0/1 values.
+    """
     class_id: int
     class_name: str
     confidence: float
     bbox: BoundingBox
     section_id: Optional[str] = None
-    mask: Optional[np.ndarray] = None  # Binary segmentation mask
+    # Binary segmentation mask (bit-packed rows when mask_shape is set). Masks from
+    # ModelInference are views into one packed (N, H, ceil(W / 8)) buffer per frame.
+    mask: Optional[np.ndarray] = None
     mask_polygon: Optional[List[List[float]]] = None  # Polygon coordinates
+    mask_shape: Optional[Tuple[int, int]] = None  # Unpacked (H, W) of a bit-packed mask
+    # Derived geometry memoized per source object: {name: (source, value)}. An entry is
+    # recomputed when mask / mask_polygon is reassigned (in-place edits are not tracked).
+    _derived_cache: Dict[str, Tuple[Any, Any]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Keep masks bit-packed (8x smaller); unpacked (H, W) masks are packed on construction
+        if self.mask is not None and self.mask_shape is None and self.mask.ndim == 2:
+            self.mask_shape = self.mask.shape
+            self.mask = pack_mask(self.mask)
     
     @property
     def center(self) -> Tuple[float, float]:
@@ -67,6 +142,22 @@ class DetectedItem:
             # Fall back to bounding box center
             return self.bbox.center
     
+    @staticmethod
+    def stack_centers(items: List['DetectedItem']) -> np.ndarray:
+        """
+        Centers of many items as one (N, 2) float64 array of x, y, so the
+        section lookups can share a single pass over item.center
+        """
+        coords = chain.from_iterable(item.center for item in items)
+        return np.fromiter(coords, dtype=np.float64, count=2 * len(items)).reshape(len(items), 2)
+    
+    def _memoized(self, name: str, source: Any, compute) -> Any:
+        """Return compute() cached against the identity of the object it derives from"""
+        entry = self._derived_cache.get(name)
+        if entry is None or entry[0] is not source:
+            entry = self._derived_cache[name] = (source, compute())
+        return entry[1]
+    
     def _calculate_polygon_centroid(self) -> Tuple[float, float]:
         """
         Calculate the centroid (center point) of the mask polygon
@@ -77,33 +168,77 @@ class DetectedItem:
         if not self.mask_polygon or len(self.mask_polygon) < 3:
             return self.bbox.center
         
-        # Calculate centroid using arithmetic mean of all points
-        total_x = 0.0
-        total_y = 0.0
+        centroid = self._memoized('centroid', self.mask_polygon, self._polygon_centroid)
+        return centroid if centroid is not None else self.bbox.center
+    
+    def _polygon_centroid(self) -> Optional[Tuple[float, float]]:
+        """Shoelace centroid of mask_polygon, or None for a zero-area polygon"""
+        # Area-weighted centroid (shoelace formula): unlike the vertex mean it is not
+        # pulled toward densely sampled stretches of the contour
+        points = self._polygon_points()
+        x, y = points[:, 0], points[:, 1]
+        x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+        cross = x * y_next - x_next * y
+        area = 0.5 * cross.sum()
         
-        for point in self.mask_polygon:
-            if len(point) >= 2:
-                total_x += point[0]
-                total_y += point[1]
+        # Degenerate (zero-area) polygon: no meaningful centroid
+        if abs(area) < 1e-9:
+            return None
         
-        num_points = len(self.mask_polygon)
-        centroid_x = total_x / num_points
-        centroid_y = total_y / num_points
+        centroid_x = ((x + x_next) * cross).sum() / (6.0 * area)
+        centroid_y = ((y + y_next) * cross).sum() / (6.0 * area)
         
-        return centroid_x, centroid_y
+        return float(centroid_x), float(centroid_y)
+    
+    def _polygon_points(self) -> np.ndarray:
+        """
+        Get mask_polygon as an (N, 2) float64 array, converted once and reused
+        until mask_polygon is reassigned
+        """
+        polygon = self.mask_polygon
+        return self._memoized(
+            'points', polygon,
+            lambda: np.asarray(polygon, dtype=np.float64).reshape(len(polygon), -1)[:, :2]
+        )
+    
+    @staticmethod
+    def to_dataframe(items: List['DetectedItem']) -> pd.DataFrame:
+        """
+        Build the detected-items DataFrame column by column.
+        Same columns and values as pd.DataFrame([item.to_dict() for item in items]),
+        without creating a dict per item. An empty list still yields all the columns.
+        """
+        centers = [item.center for item in items]
+        bboxes = [item.bbox for item in items]
+        return pd.DataFrame({
+            'class_id': [item.class_id for item in items],
+            'class_name': [item.class_name for item in items],
+            'confidence': [item.confidence for item in items],
+            'x1': [bbox.x1 for bbox in bboxes],
+            'y1': [bbox.y1 for bbox in bboxes],
+            'x2': [bbox.x2 for bbox in bboxes],
+            'y2': [bbox.y2 for bbox in bboxes],
+            'center_x': [center[0] for center in centers],
+            'center_y': [center[1] for center in centers],
+            'section_id': [item.section_id for item in items],
+            'has_mask': [item.mask is not None for item in items],
+            'mask_area': [item.calculate_mask_area() for item in items],
+            'mask_perimeter': [item.calculate_mask_perimeter() for item in items]
+        })
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for DataFrame creation"""
         center_x, center_y = self.center  # Use the smart center calculation
+        bbox = self.bbox
         
         result = {
             'class_id': self.class_id,
             'class_name': self.class_name,
             'confidence': self.confidence,
-            'x1': self.bbox.x1,
-            'y1': self.bbox.y1,
-            'x2': self.bbox.x2,
-            'y2': self.bbox.y2,
+            'x1': bbox.x1,
+            'y1': bbox.y1,
+            'x2': bbox.x2,
+            'y2': bbox.y2,
             'center_x': center_x,
             'center_y': center_y,
             'section_id': self.section_id,
@@ -117,26 +252,37 @@ class DetectedItem:
         """Calculate the area of the segmentation mask in pixels"""
         if self.mask is None:
             return 0.0
-        return float(np.sum(self.mask))
+        return self._memoized('mask_area', self.mask, self._mask_area)
+    
+    def _mask_area(self) -> float:
+        """Count mask pixels (popcount for bit-packed masks)"""
+        if self.mask_shape is not None:
+            return float(packed_mask_area(self.mask))
+        # Non-2D mask left as-is: count set pixels without an int64 sum pass
+        return float(np.count_nonzero(self.mask))
+    
+    def get_unpacked_mask(self) -> Optional[np.ndarray]:
+        """Return the segmentation mask as a uint8 (H, W) array"""
+        if self.mask is None or self.mask_shape is None:
+            return self.mask
+        return unpack_mask(self.mask, self.mask_shape)
     
     def calculate_mask_perimeter(self) -> float:
         """Calculate the perimeter of the mask using polygon coordinates"""
         if not self.mask_polygon or len(self.mask_polygon) < 3:
             return 0.0
-        
-        perimeter = 0.0
-        for i in range(len(self.mask_polygon)):
-            p1 = self.mask_polygon[i]
-            p2 = self.mask_polygon[(i + 1) % len(self.mask_polygon)]
-            
-            # Calculate Euclidean distance
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            perimeter += np.sqrt(dx*dx + dy*dy)
+        return self._memoized('perimeter', self.mask_polygon, self._polygon_perimeter)
+    
+    def _polygon_perimeter(self) -> float:
+        """Closed-contour length of mask_polygon"""
+        # Sum of edge lengths, including the closing edge back to the first vertex
+        points = self._polygon_points()
+        edges = np.roll(points, -1, axis=0) - points
+        perimeter = float(np.hypot(edges[:, 0], edges[:, 1]).sum())
         
         return perimeter
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PlanogramSection:
     """Represents a section in the planogram"""
     section_id: str
@@ -146,6 +292,12 @@ class PlanogramSection:
     expected_visible_count: int  # How many items we expect to see (considering occlusion)
     position: BoundingBox  # Expected position on shelf
     priority: str = "Medium"  # High, Medium, Low
+    # O(1) membership view of expected_items, built once at construction; edits that
+    # go through PlanogramConfig.update_section refresh it
+    expected_items_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.expected_items_set = frozenset(self.expected_items)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for configuration"""
@@ -164,7 +316,7 @@ class PlanogramSection:
             'priority': self.priority
         }
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MisplacedItem:
     """Represents an item that is not in its correct section"""
     detected_item: DetectedItem
@@ -174,17 +326,34 @@ class MisplacedItem:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for DataFrame creation"""
+        detected_item = self.detected_item
+        center_x, center_y = detected_item.bbox.center
         return {
-            'item_class': self.detected_item.class_name,
-            'confidence': self.detected_item.confidence,
+            'item_class': detected_item.class_name,
+            'confidence': detected_item.confidence,
             'expected_section': self.expected_section,
             'actual_section': self.actual_section or 'Unknown',
-            'center_x': self.detected_item.bbox.center[0],
-            'center_y': self.detected_item.bbox.center[1],
+            'center_x': center_x,
+            'center_y': center_y,
             'has_visualization': self.visualization_image is not None
         }
+    
+    @staticmethod
+    def to_dataframe(items: List['MisplacedItem']) -> pd.DataFrame:
+        """Build the misplaced-items DataFrame column by column (same output as to_dict rows)"""
+        detected = [item.detected_item for item in items]
+        centers = [detected_item.bbox.center for detected_item in detected]
+        return pd.DataFrame({
+            'item_class': [detected_item.class_name for detected_item in detected],
+            'confidence': [detected_item.confidence for detected_item in detected],
+            'expected_section': [item.expected_section for item in items],
+            'actual_section': [item.actual_section or 'Unknown' for item in items],
+            'center_x': [center[0] for center in centers],
+            'center_y': [center[1] for center in centers],
+            'has_visualization': [item.visualization_image is not None for item in items]
+        })
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class InventoryStatus:
     """Represents inventory status for a section"""
     section_id: str
@@ -204,7 +373,8 @@ class InventoryStatus:
             'status': self.status
         }
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DetailedInventoryStatus:
     """Represents detailed inventory status for a section with item type breakdown"""
     section_id: str
@@ -237,13 +407,20 @@ class DetailedInventoryStatus:
     def get_item_breakdown(self) -> List[Dict[str, Any]]:
         """Get detailed breakdown for each expected item type"""
         breakdown = []
-        all_item_types = set(self.expected_items.keys()) | set(self.detected_items.keys()) | set(self.misplaced_items.keys())
+        # Ordered union (expected, then detected, then misplaced types) built by a single
+        # dict merge, so rows come out in a stable order instead of set-hash order
+        all_item_types = {**self.expected_items, **self.detected_items, **self.misplaced_items}
+        
+        get_expected = self.expected_items.get
+        get_expected_visible = self.expected_visible_items.get
+        get_detected = self.detected_items.get
+        get_misplaced = self.misplaced_items.get
         
         for item_type in all_item_types:
-            expected = self.expected_items.get(item_type, 0)
-            expected_visible = self.expected_visible_items.get(item_type, 0)
-            detected = self.detected_items.get(item_type, 0)
-            misplaced = self.misplaced_items.get(item_type, 0)
+            expected = get_expected(item_type, 0)
+            expected_visible = get_expected_visible(item_type, 0)
+            detected = get_detected(item_type, 0)
+            misplaced = get_misplaced(item_type, 0)
             
             # Determine availability status based on new rules
             available_total = detected + misplaced
@@ -276,18 +453,36 @@ class DetailedInventoryStatus:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for DataFrame creation"""
+        total_detected = self.total_detected
+        total_misplaced = self.total_misplaced
         return {
             'section_id': self.section_id,
             'section_name': self.section_name,
             'total_expected': self.total_expected,
             'total_expected_visible': self.total_expected_visible,
-            'total_detected': self.total_detected,
-            'total_misplaced': self.total_misplaced,
-            'total_detetced': self.total_detected + self.total_misplaced,
+            'total_detected': total_detected,
+            'total_misplaced': total_misplaced,
+            'total_detetced': total_detected + total_misplaced,
             'item_breakdown': self.get_item_breakdown()
         }
+    
+    @staticmethod
+    def to_dataframe(statuses: List['DetailedInventoryStatus']) -> pd.DataFrame:
+        """Build the detailed inventory DataFrame column by column (same output as to_dict rows)"""
+        detected = [status.total_detected for status in statuses]
+        misplaced = [status.total_misplaced for status in statuses]
+        return pd.DataFrame({
+            'section_id': [status.section_id for status in statuses],
+            'section_name': [status.section_name for status in statuses],
+            'total_expected': [status.total_expected for status in statuses],
+            'total_expected_visible': [status.total_expected_visible for status in statuses],
+            'total_detected': detected,
+            'total_misplaced': misplaced,
+            'total_detetced': [d + m for d, m in zip(detected, misplaced)],
+            'item_breakdown': [status.get_item_breakdown() for status in statuses]
+        })
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Task:
     """Represents a task that needs to be completed"""
     task_id: str
@@ -307,8 +502,21 @@ class Task:
             'task_type': self.task_type,
             'estimated_time': self.estimated_time
         }
+    
+    @staticmethod
+    def to_dataframe(tasks: List['Task']) -> pd.DataFrame:
+        """Build the tasks DataFrame from field tuples (same output as to_dict rows)"""
+        # Every column is a plain field, so one attrgetter pulls each row in C
+        return pd.DataFrame(list(map(_get_task_fields, tasks)), columns=_TASK_COLUMNS)
+
+# Zero-row templates for AnalysisResults.create_empty, one per result frame
+# (only ever shallow-copied)
+_EMPTY_DETECTED_ITEMS = DetectedItem.to_dataframe([])
+_EMPTY_MISPLACED_ITEMS = MisplacedItem.to_dataframe([])
+_EMPTY_DETAILED_INVENTORY_STATUS = DetailedInventoryStatus.to_dataframe([])
+_EMPTY_TASKS = Task.to_dataframe([])
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AnalysisResults:
     """Contains all results from planogram analysis"""
     detected_items: pd.DataFrame
@@ -322,11 +530,13 @@ class AnalysisResults:
     @classmethod
     def create_empty(cls) -> 'AnalysisResults':
         """Create empty results structure"""
+        # Shallow copies of the prebuilt zero-row templates: same columns as non-empty
+        # results without rebuilding four frames, and callers still get their own objects
         return cls(
-            detected_items=pd.DataFrame(),
-            misplaced_items=pd.DataFrame(),
-            detailed_inventory_status=pd.DataFrame(),
-            tasks=pd.DataFrame(),
+            detected_items=_EMPTY_DETECTED_ITEMS.copy(deep=False),
+            misplaced_items=_EMPTY_MISPLACED_ITEMS.copy(deep=False),
+            detailed_inventory_status=_EMPTY_DETAILED_INVENTORY_STATUS.copy(deep=False),
+            tasks=_EMPTY_TASKS.copy(deep=False),
             annotated_image=None,
             raw_misplaced_items=[]
         )
@@ -1,7 +1,8 @@
 import os
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
-import pandas as pd
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 
@@ -14,6 +15,37 @@ from .config import PlanogramConfig
 from .inference import ModelInference
 from .coordinate_system import CoordinateSystem
 
+# Annotation color scheme for the detector's classes
+_CLASS_COLORS = {
+    'bottled_drinks': '#FF6B6B',      # Red
+    'canned_drinks': '#4ECDC4',       # Teal
+    'large_plates': '#45B7D1',        # Blue
+    'salads_bowls': '#96CEB4',        # Green
+    'sandwiches': '#FFEAA7',          # Yellow
+    'small_plates': '#DDA0DD',        # Plum
+    'wraps': '#98D8C8',               # Mint
+    'yogurt_cups_large': '#F7DC6F',   # Light yellow
+    'yogurt_cups_small': '#BB8FCE'    # Light purple
+}
+_DEFAULT_CLASS_COLOR = '#888888'
+_OUTLINE_WIDTH = 2
+_MASK_ALPHA = 100
+# Inventory statuses that produce a restock task, and that task's priority
+_RESTOCK_PRIORITIES = {'Sold Out': 'High', 'Low Stock': 'Medium'}
+
+
+def _hex_to_rgb(hex_color: str) -> tuple:
+    """Convert hex color to RGB tuple"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+# Semi-transparent mask fill per class, converted once at import
+_CLASS_MASK_COLORS = {
+    class_name: (*_hex_to_rgb(color), _MASK_ALPHA) for class_name, color in _CLASS_COLORS.items()
+}
+_DEFAULT_MASK_COLOR = (*_hex_to_rgb(_DEFAULT_CLASS_COLOR), _MASK_ALPHA)
+
 class PlanogramAnalyzer:
     """Main class for analyzing planogram images and detecting compliance issues"""
     
@@ -44,12 +76,14 @@ class PlanogramAnalyzer:
             return self.config.planogram_image_path
         return None
     
-    def analyze_image(self, image: Image.Image) -> Dict[str, Any]:
+    def analyze_image(self, image: Image.Image, include_annotated: bool = True) -> Dict[str, Any]:
         """
         Main analysis function that processes an image and returns comprehensive results
         
         Args:
             image: PIL Image to analyze
+            include_annotated: Render the annotated image. Pass False when only the
+                tables are needed; annotated_image is then None in the results.
         """
         if not self.config:
             return self._create_empty_results("No planogram configuration loaded")
@@ -66,11 +100,8 @@ class PlanogramAnalyzer:
                 image, confidence_threshold, iou_threshold
             )
             
-            # Step 2: Assign detected items to sections
-            self._assign_items_to_sections(detected_items)
-            
-            # Step 3: Find misplaced items
-            misplaced_items = self._find_misplaced_items(detected_items)
+            # Steps 2-3: Assign detected items to sections and find misplaced items
+            misplaced_items = self._classify_items(detected_items)
             
             # Step 4: Generate visualizations for misplaced items
             self._generate_misplaced_item_visualizations(image, misplaced_items)
@@ -81,15 +112,18 @@ class PlanogramAnalyzer:
             # Step 6: Generate tasks
             tasks = self._generate_tasks(detailed_inventory_status, misplaced_items)
             
-            # Step 7: Create annotated image
-            annotated_image = self._create_annotated_image(image, detected_items, misplaced_items)
+            # Step 7: Create annotated image (skipped for table-only callers)
+            # (drawn on a copy: the caller keeps displaying the uploaded image)
+            annotated_image = None
+            if include_annotated:
+                annotated_image = self._create_annotated_image(image, detected_items, misplaced_items)
             
             # Step 8: Convert to DataFrames
             results = AnalysisResults(
-                detected_items=pd.DataFrame([item.to_dict() for item in detected_items]),
-                misplaced_items=pd.DataFrame([item.to_dict() for item in misplaced_items]),
-                detailed_inventory_status=pd.DataFrame([status.to_dict() for status in detailed_inventory_status]),
-                tasks=pd.DataFrame([task.to_dict() for task in tasks]) if tasks else pd.DataFrame(),
+                detected_items=DetectedItem.to_dataframe(detected_items),
+                misplaced_items=MisplacedItem.to_dataframe(misplaced_items),
+                detailed_inventory_status=DetailedInventoryStatus.to_dataframe(detailed_inventory_status),
+                tasks=Task.to_dataframe(tasks),
                 annotated_image=annotated_image,
                 raw_misplaced_items=misplaced_items  # Store raw items for visualization access
             )
@@ -131,58 +165,89 @@ class PlanogramAnalyzer:
                 confidence=detection['confidence'],
                 bbox=bbox,  # Reference coordinates
                 mask=detection.get('mask'),
-                mask_polygon=detection.get('mask_polygon', [])  # Also normalized
+                mask_polygon=detection.get('mask_polygon', []),  # Also normalized
+                mask_shape=detection.get('mask_shape')
             )
             detected_items.append(item)
         
         return detected_items
     
-    def _assign_items_to_sections(self, detected_items: List[DetectedItem]) -> None:
-        """Assign detected items to their corresponding planogram sections using polygon centroids"""
-        for item in detected_items:
-            # Use the DetectedItem's smart center calculation (polygon centroid or bbox center)
-            center_x, center_y = item.center
+    def _classify_items(self, detected_items: List[DetectedItem]) -> List[MisplacedItem]:
+        """
+        Assign detected items to their planogram sections and find the misplaced ones,
+        in one pass over the item centers (polygon centroids or bbox centers)
+        
+        Args:
+            detected_items: Items to classify; each item's section_id is set in place
             
-            # Find which section contains this center point
-            section = self.config.find_section_by_position(center_x, center_y)
-            item.section_id = section.section_id if section else None
-    
-    def _find_misplaced_items(self, detected_items: List[DetectedItem]) -> List[MisplacedItem]:
-        """Find misplaced items using geometric containment logic with polygon centroids"""
-        misplaced_items = []
+        Returns:
+            Misplaced items in detection order
+        """
+        if not detected_items:
+            return []
+        
+        # Use the DetectedItem's smart center calculation (polygon centroid or bbox center)
+        centers = DetectedItem.stack_centers(detected_items)
+        
+        # Test every center against every section once; the same containment matrix
+        # gives each item's section and, sliced by class, its expected-section check
+        inside = self.config.sections_containing_positions(centers[:, 0], centers[:, 1])
+        section_indices = self.config.first_containing_sections(inside)
+        
+        # Single loop over the items: record the containing section, and group items by
+        # class so each class is tested against its expected sections at once
+        sections = self.config.sections
+        items_by_class: Dict[str, List[int]] = {}
+        for index, (item, section_index) in enumerate(zip(detected_items, section_indices.tolist())):
+            item.section_id = sections[section_index].section_id if section_index >= 0 else None
+            items_by_class.setdefault(item.class_name, []).append(index)
         
-        for item in detected_items:
-            # Get sections where this item should be placed
-            expected_sections = self.config.get_sections_for_item(item.class_name)
+        # Expected section each misplaced item is reported against, by item index
+        closest_by_index: Dict[int, Optional[PlanogramSection]] = {}
+        
+        for class_name, indices in items_by_class.items():
+            # Rows of self.config.sections where this class should be placed
+            expected_rows = self.config.get_section_rows_for_item(class_name)
             
-            if not expected_sections:
+            if not len(expected_rows):
                 continue  # Item not in planogram, skip
             
-            # Use the DetectedItem's smart center calculation (polygon centroid or bbox center)
-            center_x, center_y = item.center
-            
-            # Check if item's center is within ANY of its expected sections
-            item_in_expected_section = False
-            correct_section_id = None
-            
-            for section in expected_sections:
-                # Check if center point is within this section's boundaries
-                if self._point_in_section(center_x, center_y, section):
-                    item_in_expected_section = True
-                    correct_section_id = section.section_id
-                    break
-            
-            # If the item's center is not in any expected section, it's misplaced
-            if not item_in_expected_section:
-                # Find the closest expected section for reporting purposes
-                closest_section = self._find_closest_expected_section(center_x, center_y, expected_sections)
-                
-                misplaced = MisplacedItem(
-                    detected_item=item,
-                    expected_section=closest_section.section_id if closest_section else "Unknown",
-                    actual_section=item.section_id,  # Where it currently is (could be None)
-                )
-                misplaced_items.append(misplaced)
+            # An item already assigned to one of its expected sections is correctly
+            # placed; only the others need the containment test
+            indices = np.asarray(indices)
+            indices = indices[~np.isin(section_indices[indices], expected_rows)]
+            if not len(indices):
+                continue
+            
+            # Check if each item's center is within ANY of its expected sections
+            in_expected_section = inside[np.ix_(indices, expected_rows)].any(axis=1)
+            if in_expected_section.all():
+                continue
+            
+            # For the misplaced ones, find the closest expected section (by section center)
+            # for reporting purposes; argmin over squared distances picks the same section
+            misplaced = ~in_expected_section
+            class_centers = centers[indices]
+            xs, ys = class_centers[:, 0:1], class_centers[:, 1:2]
+            x1, y1, x2, y2 = self.config.get_section_bounds_for_item(class_name).T
+            dx = xs[misplaced] - (x1 + x2) / 2
+            dy = ys[misplaced] - (y1 + y2) / 2
+            closest = (dx * dx + dy * dy).argmin(axis=1)
+            
+            misplaced_indices = indices[misplaced].tolist()
+            for index, row in zip(misplaced_indices, expected_rows[closest].tolist()):
+                closest_by_index[index] = sections[row]
+        
+        # Report in detection order
+        misplaced_items = []
+        for index in sorted(closest_by_index):
+            item = detected_items[index]
+            closest_section = closest_by_index[index]
+            misplaced_items.append(MisplacedItem(
+                detected_item=item,
+                expected_section=closest_section.section_id if closest_section else "Unknown",
+                actual_section=item.section_id,  # Where it currently is (could be None)
+            ))
         
         return misplaced_items
     
@@ -205,26 +270,20 @@ class PlanogramAnalyzer:
                 viz_image = original_image.copy()
                 draw = ImageDraw.Draw(viz_image)
                 
-                # Try to load a font, fallback to default if not available
-                try:
-                    font = ImageFont.truetype("arial.ttf", 20)
-                    small_font = ImageFont.truetype("arial.ttf", 16)
-                except:
-                    try:
-                        font = ImageFont.load_default()
-                        small_font = ImageFont.load_default()
-                    except:
-                        font = None
-                        small_font = None
+                # Fonts are loaded once per size and shared across calls
+                font = self._get_font(20)
+                small_font = self._get_font(16)
                 
                 # Get the misplaced item's position in display coordinates
-                item_bbox = CoordinateSystem.reference_to_original(
-                    misplaced_item.detected_item.bbox, original_image
+                # (raw tuples: the boxes are only drawn, so no BoundingBox is built)
+                bbox = misplaced_item.detected_item.bbox
+                item_box = CoordinateSystem.reference_to_original_tuple(
+                    bbox.x1, bbox.y1, bbox.x2, bbox.y2, original_image
                 )
                 
                 # Draw the misplaced item with a thick red outline
                 draw.rectangle(
-                    [item_bbox.x1, item_bbox.y1, item_bbox.x2, item_bbox.y2],
+                    item_box,
                     outline="#FF0000",  # Red for misplaced item
                     width=4
                 )
@@ -232,12 +291,12 @@ class PlanogramAnalyzer:
                 # Draw the item's mask if available
                 if misplaced_item.detected_item.mask_polygon:
                     try:
-                        display_polygon = []
-                        for point in misplaced_item.detected_item.mask_polygon:
-                            if len(point) >= 2:
-                                ref_point = BoundingBox(point[0], point[1], point[0], point[1])
-                                display_point = CoordinateSystem.reference_to_original(ref_point, original_image)
-                                display_polygon.append((int(display_point.x1), int(display_point.y1)))
+                        polygon = misplaced_item.detected_item.mask_polygon
+                        points = np.asarray(polygon, dtype=np.float64).reshape(len(polygon), -1)[:, :2]
+                        # Flat [x0, y0, x1, y1, ...] list, as accepted by ImageDraw.polygon
+                        display_polygon = CoordinateSystem.reference_to_original_points(
+                            points, original_image
+                        ).ravel().tolist()
                         
                         if display_polygon:
                             draw.polygon(display_polygon, outline="#FF0000", width=3)
@@ -246,37 +305,27 @@ class PlanogramAnalyzer:
                 
                 # Draw current section (if any) with orange outline
                 if misplaced_item.actual_section:
-                    current_section = None
-                    for section in self.config.sections:
-                        if section.section_id == misplaced_item.actual_section:
-                            current_section = section
-                            break
+                    current_section = self.config.get_section_by_id(misplaced_item.actual_section)
                     
                     if current_section:
-                        current_section_bbox = CoordinateSystem.reference_to_original(
-                            current_section.position, original_image
-                        )
+                        bbox = current_section.position
                         draw.rectangle(
-                            [current_section_bbox.x1, current_section_bbox.y1, 
-                             current_section_bbox.x2, current_section_bbox.y2],
+                            CoordinateSystem.reference_to_original_tuple(
+                                bbox.x1, bbox.y1, bbox.x2, bbox.y2, original_image
+                            ),
                             outline="#FFA500",  # Orange for current section
                             width=3
                         )
                 
                 # Draw expected section with green outline
-                expected_section = None
-                for section in self.config.sections:
-                    if section.section_id == misplaced_item.expected_section:
-                        expected_section = section
-                        break
+                expected_section = self.config.get_section_by_id(misplaced_item.expected_section)
                 
                 if expected_section:
-                    expected_section_bbox = CoordinateSystem.reference_to_original(
-                        expected_section.position, original_image
-                    )
+                    bbox = expected_section.position
                     draw.rectangle(
-                        [expected_section_bbox.x1, expected_section_bbox.y1, 
-                         expected_section_bbox.x2, expected_section_bbox.y2],
+                        CoordinateSystem.reference_to_original_tuple(
+                            bbox.x1, bbox.y1, bbox.x2, bbox.y2, original_image
+                        ),
                         outline="#00FF00",  # Green for expected section
                         width=3
                     )
@@ -359,53 +408,6 @@ class PlanogramAnalyzer:
                 print(f"⚠️ Error creating visualization for misplaced item {misplaced_item.detected_item.class_name}: {e}")
                 misplaced_item.visualization_image = None
     
-    def _point_in_section(self, x: float, y: float, section: PlanogramSection) -> bool:
-        """
-        Check if a point is within a section's boundaries
-        
-        Args:
-            x: X coordinate of the point
-            y: Y coordinate of the point
-            section: PlanogramSection to check against
-            
-        Returns:
-            True if point is within section boundaries, False otherwise
-        """
-        bbox = section.position
-        return bbox.x1 <= x <= bbox.x2 and bbox.y1 <= y <= bbox.y2
-    
-    def _find_closest_expected_section(self, x: float, y: float, 
-                                     expected_sections: List[PlanogramSection]) -> Optional[PlanogramSection]:
-        """
-        Find the closest expected section to a given point
-        
-        Args:
-            x: X coordinate of the point
-            y: Y coordinate of the point
-            expected_sections: List of sections where the item should be
-            
-        Returns:
-            The closest expected section, or None if no sections provided
-        """
-        if not expected_sections:
-            return None
-        
-        min_distance = float('inf')
-        closest_section = None
-        
-        for section in expected_sections:
-            # Calculate distance from point to section center
-            section_center_x = (section.position.x1 + section.position.x2) / 2
-            section_center_y = (section.position.y1 + section.position.y2) / 2
-            
-            distance = ((x - section_center_x) ** 2 + (y - section_center_y) ** 2) ** 0.5
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_section = section
-        
-        return closest_section
-    
     def _calculate_detailed_inventory_status(
         self, 
         detected_items: List[DetectedItem], 
@@ -414,24 +416,23 @@ class PlanogramAnalyzer:
         """Calculate detailed inventory status for each section with item type breakdown"""
         detailed_status = []
         
-        # Count detected items by section and type
+        # Count detected items by section and type: Counter tallies the
+        # (section, class) pairs in C, then one loop per distinct pair pivots them
         section_item_counts = {}
-        for item in detected_items:
-            if item.section_id:
-                if item.section_id not in section_item_counts:
-                    section_item_counts[item.section_id] = {}
-                item_type = item.class_name
-                section_item_counts[item.section_id][item_type] = section_item_counts[item.section_id].get(item_type, 0) + 1
+        pair_counts = Counter(
+            (item.section_id, item.class_name) for item in detected_items if item.section_id
+        )
+        for (section_id, item_type), count in pair_counts.items():
+            section_item_counts.setdefault(section_id, {})[item_type] = count
         
         # Count misplaced items by their expected sections and types
         misplaced_counts = {}
-        for misplaced in misplaced_items:
-            expected_section = misplaced.expected_section
-            item_type = misplaced.detected_item.class_name
-            
-            if expected_section not in misplaced_counts:
-                misplaced_counts[expected_section] = {}
-            misplaced_counts[expected_section][item_type] = misplaced_counts[expected_section].get(item_type, 0) + 1
+        pair_counts = Counter(
+            (misplaced.expected_section, misplaced.detected_item.class_name)
+            for misplaced in misplaced_items
+        )
+        for (expected_section, item_type), count in pair_counts.items():
+            misplaced_counts.setdefault(expected_section, {})[item_type] = count
         
         # Create detailed status for each configured section
         for section in self.config.sections:
@@ -477,42 +478,40 @@ class PlanogramAnalyzer:
         misplaced_items: List[MisplacedItem]
     ) -> List[Task]:
         """Generate tasks based on detailed inventory and misplaced items"""
-        tasks = []
-        task_counter = 1
-
-        # Tasks for misplaced items (relocate)
-        for item in misplaced_items:
-            task = Task(
-                task_id=f"RELOCATE_{task_counter:03d}",
+        # Tasks for misplaced items (relocate), numbered from 1
+        tasks = [
+            Task(
+                task_id=f"RELOCATE_{task_number:03d}",
                 description=f"Move {item.detected_item.class_name} from {item.actual_section or 'unknown'} to {item.expected_section}",
                 section_id=item.expected_section,
                 priority="Medium",
                 task_type="Relocate",
                 estimated_time=5
             )
-            tasks.append(task)
-            task_counter += 1
+            for task_number, item in enumerate(misplaced_items, start=1)
+        ]
 
-        # Tasks from detailed inventory breakdown (restock, check, etc.)
-        for section_status in detailed_inventory:
-            section_id = section_status.section_id
-            section_name = section_status.section_name
-            
-            for item_breakdown in section_status.get_item_breakdown():
-                item_type = item_breakdown['item_type']
-                status = item_breakdown['availability_status']
-                
-                if status == "Sold Out" or status == "Low Stock":
-                    task = Task(
-                        task_id=f"RESTOCK_{task_counter:03d}",
-                        description=f"Restock {item_type} in {section_name} ({status})",
-                        section_id=section_id,
-                        priority="High" if status == "Sold Out" else "Medium",
-                        task_type="Restock",
-                        estimated_time=10
-                    )
-                    tasks.append(task)
-                    task_counter += 1
+        # Tasks from detailed inventory breakdown (restock): filter the breakdown rows
+        # by status first, then build them in one pass continuing the numbering
+        restock_rows = [
+            (section_status.section_id, section_status.section_name,
+             item_breakdown['item_type'], item_breakdown['availability_status'])
+            for section_status in detailed_inventory
+            for item_breakdown in section_status.get_item_breakdown()
+            if item_breakdown['availability_status'] in _RESTOCK_PRIORITIES
+        ]
+        tasks.extend(
+            Task(
+                task_id=f"RESTOCK_{task_number:03d}",
+                description=f"Restock {item_type} in {section_name} ({status})",
+                section_id=section_id,
+                priority=_RESTOCK_PRIORITIES[status],
+                task_type="Restock",
+                estimated_time=10
+            )
+            for task_number, (section_id, section_name, item_type, status)
+            in enumerate(restock_rows, start=len(tasks) + 1)
+        )
 
         return tasks
     
@@ -527,96 +526,97 @@ class PlanogramAnalyzer:
         annotated = original_image.copy()
         draw = ImageDraw.Draw(annotated)
         
-        # Try to load a font, fallback to default if not available
-        try:
-            from PIL import ImageFont
-            font = ImageFont.truetype("arial.ttf", 16)
-        except:
-            try:
-                font = ImageFont.load_default()
-            except:
-                font = None
+        # Fonts are loaded once per size and shared across calls
+        font = self._get_font(16)
         
         # Color scheme for different classes
-        class_colors = {
-            'bottled_drinks': '#FF6B6B',      # Red
-            'canned_drinks': '#4ECDC4',       # Teal
-            'large_plates': '#45B7D1',        # Blue
-            'salads_bowls': '#96CEB4',        # Green
-            'sandwiches': '#FFEAA7',          # Yellow
-            'small_plates': '#DDA0DD',        # Plum
-            'wraps': '#98D8C8',               # Mint
-            'yogurt_cups_large': '#F7DC6F',   # Light yellow
-            'yogurt_cups_small': '#BB8FCE'    # Light purple
-        }
+        class_colors = _CLASS_COLORS
+        width = _OUTLINE_WIDTH
+        
+        # Convert all boxes from reference coordinates to display coordinates in one pass
+        display_bboxes = CoordinateSystem.get_display_coordinates_batch(
+            [item.bbox for item in detected_items], original_image
+        )
+        
+        # Convert every mask polygon to display coordinates in one batched transform,
+        # then hand each item its slice of the flat [x0, y0, x1, y1, ...] vertex list
+        display_polygons = {}
+        try:
+            polygon_items = [i for i, item in enumerate(detected_items) if item.mask_polygon]
+            if polygon_items:
+                polygons = [
+                    np.asarray(detected_items[i].mask_polygon, dtype=np.float64)
+                    .reshape(len(detected_items[i].mask_polygon), -1)[:, :2]
+                    for i in polygon_items
+                ]
+                flat_points = CoordinateSystem.reference_to_original_points(
+                    np.concatenate(polygons), original_image
+                ).ravel().tolist()
+                ends = np.cumsum([2 * len(points) for points in polygons]).tolist()
+                for i, start, end in zip(polygon_items, [0] + ends[:-1], ends):
+                    display_polygons[i] = flat_points[start:end]
+        except Exception as e:
+            print(f"⚠️ Error converting mask polygons: {e}")
+            display_polygons = {}
+        
+        # Fill every mask into one shared overlay and composite it onto the image once,
+        # instead of a full-image alpha_composite per polygon. Outlines and labels are
+        # drawn afterwards so they stay on top of the masks.
+        if display_polygons:
+            mask_overlay = Image.new('RGBA', annotated.size, (0, 0, 0, 0))
+            mask_draw = ImageDraw.Draw(mask_overlay)
+            for index, display_polygon in display_polygons.items():
+                if not display_polygon:
+                    continue
+                item = detected_items[index]
+                try:
+                    # Semi-transparent color for mask overlay
+                    mask_color = _CLASS_MASK_COLORS.get(item.class_name, _DEFAULT_MASK_COLOR)
+                    mask_draw.polygon(display_polygon, fill=mask_color)
+                except Exception as e:
+                    print(f"⚠️ Error drawing mask for {item.class_name}: {e}")
+                    # Outline this item with its bounding box instead
+                    display_polygons[index] = None
+            
+            annotated = Image.alpha_composite(annotated.convert('RGBA'), mask_overlay).convert('RGB')
+            draw = ImageDraw.Draw(annotated)
         
         # Draw detected items
-        for item in detected_items:
-            # Convert from reference coordinates to display coordinates
-            display_bbox = CoordinateSystem.reference_to_original(item.bbox, original_image)
+        for index, (item, display_bbox) in enumerate(zip(detected_items, display_bboxes)):
             
             # Use class-specific color for all items
-            color = class_colors.get(item.class_name, '#888888')
-            width = 2
+            color = class_colors.get(item.class_name, _DEFAULT_CLASS_COLOR)
+            box = (display_bbox.x1, display_bbox.y1, display_bbox.x2, display_bbox.y2)
             
             # Create label
             label = f"{item.class_name} ({item.confidence:.2f})"
             
             # Handle mask visualization if available
             if item.mask is not None or item.mask_polygon:
-                # Semi-transparent color for mask overlay
-                mask_color = (*self._hex_to_rgb(color), 100)  # Semi-transparent
-                
                 try:
                     # Try polygon-based mask first (more efficient)
                     if item.mask_polygon:
-                        # Convert polygon coordinates from reference to display
-                        display_polygon = []
-                        for point in item.mask_polygon:
-                            if len(point) >= 2:
-                                # Transform point from reference to original coordinates
-                                ref_bbox_point = BoundingBox(point[0], point[1], point[0], point[1])
-                                display_point = CoordinateSystem.reference_to_original(ref_bbox_point, original_image)
-                                display_polygon.append((int(display_point.x1), int(display_point.y1)))
+                        # Polygon already converted and filled into the mask overlay above
+                        display_polygon = display_polygons.get(index)
                         
                         if display_polygon:
-                            # Create a mask overlay
-                            mask_overlay = Image.new('RGBA', annotated.size, (0, 0, 0, 0))
-                            mask_draw = ImageDraw.Draw(mask_overlay)
-                            
-                            # Draw filled polygon for mask
-                            mask_draw.polygon(display_polygon, fill=mask_color)
-                            
-                            # Composite the mask overlay onto the annotated image
-                            annotated = Image.alpha_composite(annotated.convert('RGBA'), mask_overlay).convert('RGB')
-                            draw = ImageDraw.Draw(annotated)
-                            
                             # Draw polygon outline
                             draw.polygon(display_polygon, outline=color, width=width)
+                        elif display_polygon is None:
+                            # Polygon could not be converted: fall back to bounding box
+                            draw.rectangle(box, outline=color, width=width)
                         
                     else:
                         # Fallback to bounding box visualization
-                        draw.rectangle(
-                            [display_bbox.x1, display_bbox.y1, display_bbox.x2, display_bbox.y2],
-                            outline=color,
-                            width=width
-                        )
+                        draw.rectangle(box, outline=color, width=width)
                         
                 except Exception as e:
                     print(f"⚠️ Error drawing mask for {item.class_name}: {e}")
                     # Fallback to bounding box
-                    draw.rectangle(
-                        [display_bbox.x1, display_bbox.y1, display_bbox.x2, display_bbox.y2],
-                        outline=color,
-                        width=width
-                    )
+                    draw.rectangle(box, outline=color, width=width)
             else:
                 # Draw bounding box only
-                draw.rectangle(
-                    [display_bbox.x1, display_bbox.y1, display_bbox.x2, display_bbox.y2],
-                    outline=color,
-                    width=width
-                )
+                draw.rectangle(box, outline=color, width=width)
             
             # Draw label with background
             if font:
@@ -680,71 +680,18 @@ class PlanogramAnalyzer:
         
         return annotated
     
-    def _get_class_colors(self, detected_items: List[DetectedItem]) -> Dict[str, str]:
-        """
-        Generate unique colors for each class
-        
-        Args:
-            detected_items: List of detected items
-            
-        Returns:
-            Dictionary mapping class names to colors
-        """
-        # Predefined color palette for classes
-        colors = [
-            "blue", "green", "orange", "purple", "brown", "pink", "gray", 
-            "cyan", "magenta", "lime", "navy", "maroon", "olive", "teal",
-            "coral", "gold", "indigo", "violet", "crimson", "forestgreen"
-        ]
-        
-        # Get unique class names
-        unique_classes = list(set(item.class_name for item in detected_items))
-        
-        # Create color mapping
-        class_colors = {}
-        for i, class_name in enumerate(unique_classes):
-            color_index = i % len(colors)
-            class_colors[class_name] = colors[color_index]
-        
-        return class_colors
-    
-    def _color_name_to_rgba(self, color_name: str, alpha: int = 255) -> Tuple[int, int, int, int]:
-        """
-        Convert color name to RGBA tuple
-        
-        Args:
-            color_name: Name of the color
-            alpha: Alpha value (0-255)
-            
-        Returns:
-            RGBA tuple
-        """
-        color_map = {
-            "red": (255, 0, 0),
-            "green": (0, 255, 0),
-            "blue": (0, 0, 255),
-            "orange": (255, 165, 0),
-            "purple": (128, 0, 128),
-            "brown": (165, 42, 42),
-            "pink": (255, 192, 203),
-            "gray": (128, 128, 128),
-            "cyan": (0, 255, 255),
-            "magenta": (255, 0, 255),
-            "lime": (0, 255, 0),
-            "navy": (0, 0, 128),
-            "maroon": (128, 0, 0),
-            "olive": (128, 128, 0),
-            "teal": (0, 128, 128),
-            "coral": (255, 127, 80),
-            "gold": (255, 215, 0),
-            "indigo": (75, 0, 130),
-            "violet": (238, 130, 238),
-            "crimson": (220, 20, 60),
-            "forestgreen": (34, 139, 34)
-        }
-        
-        rgb = color_map.get(color_name.lower(), (0, 0, 255))  # Default to blue
-        return rgb + (alpha,)
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_font(size: int):
+        """Load the label font at the given size (cached), falling back to PIL's default"""
+        # Try to load a font, fallback to default if not available
+        try:
+            return ImageFont.truetype("arial.ttf", size)
+        except Exception:
+            try:
+                return ImageFont.load_default()
+            except Exception:
+                return None
     
     def _draw_color_legend(self, image: Image.Image, class_colors: Dict[str, str], font) -> None:
         """
@@ -804,51 +751,6 @@ class PlanogramAnalyzer:
                 font=font
             )
     
-    def _draw_mask_overlay(
-        self, 
-        image: Image.Image, 
-        mask: np.ndarray, 
-        color: Tuple[int, int, int, int]
-    ) -> Image.Image:
-        """
-        Draw a binary mask overlay on an image
-        
-        Args:
-            image: PIL Image to draw on
-            mask: Binary mask as numpy array (H, W)
-            color: RGBA color tuple for the mask
-            
-        Returns:
-            Image with mask overlay
-        """
-        try:
-            # Convert mask to PIL Image
-            mask_pil = Image.fromarray(mask.astype(np.uint8) * 255, mode='L')
-            
-            # Resize mask to match image size if needed
-            if mask_pil.size != image.size:
-                mask_pil = mask_pil.resize(image.size, Image.NEAREST)
-            
-            # Create color overlay
-            color_overlay = Image.new('RGBA', image.size, color)
-            
-            # Apply mask as alpha channel
-            color_overlay.putalpha(mask_pil)
-            
-            # Composite with original image
-            result = Image.alpha_composite(image.convert('RGBA'), color_overlay)
-            
-            return result.convert('RGB')
-            
-        except Exception as e:
-            print(f"⚠️ Error creating mask overlay: {e}")
-            return image
-    
     def _create_empty_results(self, message: str = "No results") -> Dict[str, Any]:
         """Create empty results structure with error message"""
-        return AnalysisResults.create_empty()
-    
-    def _hex_to_rgb(self, hex_color: str) -> tuple:
-        """Convert hex color to RGB tuple"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4)) 
\ No newline at end of file
+        return AnalysisResults.create_empty() 
\ No newline at end of file
@@ -37,6 +37,9 @@ class PlanogramAnnotator:
             raise FileNotFoundError(f"Planogram image not found: {image_path} (original: {self.config.planogram_image_path})")
         
         image = Image.open(image_path)
+        if image.format == 'JPEG':
+            # Decode JPEGs straight at a reduced scale that still covers target_size
+            image.draft('RGB', target_size)
         
         # Resize image to target size while maintaining aspect ratio
         resized_image = self._resize_image_with_aspect_ratio(image, target_size)
@@ -202,13 +205,15 @@ class PlanogramAnnotator:
             draw.text((legend_x + 20, legend_y + y_offset), priority, fill="black", font=font)
             y_offset += 20
     
-    def _resize_image_with_aspect_ratio(self, image: Image.Image, target_size: tuple) -> Image.Image:
+    def _resize_image_with_aspect_ratio(self, image: Image.Image, target_size: tuple,
+                                        resample: int = Image.Resampling.BILINEAR) -> Image.Image:
         """
         Resize image to target size while maintaining aspect ratio
         
         Args:
             image: Original PIL Image
             target_size: Target (width, height)
+            resample: PIL resampling filter (pass Image.Resampling.LANCZOS for maximum sharpness)
             
         Returns:
             Resized PIL Image
@@ -225,8 +230,9 @@ class PlanogramAnnotator:
         new_width = int(original_width * scale)
         new_height = int(original_height * scale)
         
-        # Resize image
-        resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Resize image (Pillow's bilinear filter is antialiased when downscaling, at a
+        # fraction of LANCZOS's kernel cost)
+        resized = image.resize((new_width, new_height), resample)
         
         # Create new image with exact target size and paste resized image centered
         final_image = Image.new('RGB', target_size, (255, 255, 255))  # White background
@@ -271,7 +277,7 @@ class PlanogramAnnotator:
         """Get summary information about all sections"""
         return {
             'total_sections': len(self.config.sections),
-            'total_expected_items': sum(section.expected_count for section in self.config.sections),
+            'total_expected_items': self.config.get_total_expected_count(),
             'sections_by_priority': {
                 priority: len([s for s in self.config.sections if s.priority == priority])
                 for priority in ['High', 'Medium', 'Low']
@@ -1,7 +1,6 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.widgets import Button
-import json
 import os
 from typing import Dict, List, Optional, Tuple
 from PIL import Image
@@ -265,12 +264,11 @@ class SectionDrawer:
             config_data["sections"].append(section_config)
         
         # Save to file
-        from .config import DeploymentConfig
+        from .config import DeploymentConfig, _json_dump
         output_file = os.path.join(DeploymentConfig.get_config_dir(), f"{store_id.lower()}_custom.json")
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
-        with open(output_file, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        _json_dump(config_data, output_file)
         
         print(f"\n✅ Configuration saved to: {output_file}")
         print("You can now use this configuration in your planogram demo!")
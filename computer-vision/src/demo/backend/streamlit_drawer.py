@@ -1,5 +1,4 @@
 import streamlit as st
-import json
 import os
 import pandas as pd
 from PIL import Image, ImageDraw
@@ -8,7 +7,7 @@ import base64
 import io
 from typing import List, Dict, Tuple, Optional
 from .coordinate_system import CoordinateSystem
-from .config import DeploymentConfig
+from .config import DeploymentConfig, _json_dump
 
 # Import the drawable canvas component
 try:
@@ -305,8 +304,7 @@ def save_planogram_config(config_data: Dict, image: Image.Image) -> Tuple[str, s
     os.makedirs(config_dir, exist_ok=True)
     config_file = os.path.join(config_dir, f"{store_id.lower()}_custom.json")
     
-    with open(config_file, 'w') as f:
-        json.dump(config_data, f, indent=2)
+    _json_dump(config_data, config_file)
     
     # Save planogram image
     image_dir = DeploymentConfig.get_images_dir()